@@ -0,0 +1,89 @@
+# benchmarks/model_memory.py
+"""
+Per-node memory of the map model at 100k nodes, before and after the compact model.
+
+    python -m benchmarks.model_memory [--nodes 100000] [--refs 2]
+
+"before" rebuilds the previous representation (plain classes with a __dict__, a uuid4
+string per node and per reference, one dict per reference); "after" uses the current
+slotted LogicNode / Reference. Nodes are created without drawing, so no display is needed.
+"""
+import argparse
+import gc
+import tracemalloc
+import uuid
+
+from objects.model import IdRegistry, Reference
+from objects.node import LogicNode
+
+TYPES = ["Question", "Problem", "Solution", "Explanation", "Conclusion"]
+
+
+class _LegacyNode:
+    """Attribute layout of LogicNode before __slots__ and compact ids."""
+    def __init__(self, app, x, y, node_type, text, width, height):
+        self.app = app
+        self.node_type = node_type
+        self.text = text
+        self.references = []
+        self.x = x
+        self.y = y
+        self.width = int(width)
+        self.height = int(height)
+        self.id = str(uuid.uuid4())
+        self.rect_id = None
+        self.text_id = None
+        self.type_id = None
+        self.handle_id = None
+
+
+def build_legacy(n, refs, texts):
+    nodes = []
+    for i in range(n):
+        # "".join gives each node its own type string, as XML parsing does
+        node = _LegacyNode(None, float(i), float(i), "".join(TYPES[i % 5]), texts[i % 100], 150, 60)
+        for r in range(refs):
+            node.references.append({'id': str(uuid.uuid4()), 'title': texts[r], 'link': "", 'desc': "", 'file': ""})
+        nodes.append(node)
+    return nodes
+
+
+def build_compact(n, refs, texts):
+    nodes = []
+    registry = IdRegistry()
+    for i in range(n):
+        node = LogicNode(None, float(i), float(i), "".join(TYPES[i % 5]), texts[i % 100], width=150, height=60,
+                         draw=False, registry=registry)
+        for r in range(refs):
+            node.references.append(Reference(registry, texts[r]))
+        nodes.append(node)
+    return nodes
+
+
+def measure(builder, n, refs, texts):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = builder(n, refs, texts)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del nodes
+    return used
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--refs", type=int, default=2, help="References per node")
+    args = parser.parse_args(argv)
+
+    # Node texts are shared so the numbers reflect model overhead, not user content
+    texts = [f"Argument {i}" for i in range(100)]
+    for label, builder in (("before (dict, uuid str)", build_legacy), ("after (slots, compact)", build_compact)):
+        used = measure(builder, args.nodes, args.refs, texts)
+        print(f"{label:<26} {used / 1e6:8.1f} MB total  {used / args.nodes:8.0f} B/node "
+              f"(incl. {args.refs} refs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 # constants.py
+import os
 
 # --- Application Info ---
 TITLE = "Thesis Flow"
@@ -9,6 +10,9 @@ DESCRIPTION = "A Logic Map Tool for Research Papers."
 BASE_NODE_WIDTH = 150
 BASE_NODE_HEIGHT = 60
 BASE_FONT_SIZE = 9
+ZOOM_MIN, ZOOM_MAX = 0.2, 3.0
+CANVAS_MARGIN = 1000 # Scroll room kept around the content and the view (canvas pixels)
+GRID_STEP = 100
 
 # --- Color Palette ---
 COLORS = {
@@ -21,7 +25,11 @@ COLORS = {
     "Selected": "#0078D7",    # Deep Blue Border when selected
     "Handle": "#FF9500",      # Orange Resize Grip [Image of Resize Grip]
     "LineDefault": "black",
-    "LineSelected": "red"
+    "LineSelected": "red",
+    "DiffAdded": "#2e7d32",   # Compare With...: only in this map
+    "DiffRemoved": "#c62828", # only in the other file (dashed ghost)
+    "DiffChanged": "#ef6c00"  # edited between the two
 }
 ATTACHMENT_DIR = "journal_files"
+SNAPSHOT_PATH = os.path.join(os.path.expanduser("~"), ".thesisflow", "last_project.json") # Last-project cache
 ICO_PATH = "logo.ico"
\ No newline at end of file
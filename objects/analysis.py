@@ -0,0 +1,387 @@
+# objects/analysis.py
+"""
+Incremental checks on the argument graph.
+
+The analyzer mirrors the logic map (node types, reference counts and arrows) and keeps
+its derived state up to date on every edit instead of re-scanning the whole map:
+  * strongly connected components, to report cycles
+  * degree counts, to report orphan nodes
+  * per-node reachability flags, to report Questions without a Problem -> Solution path
+  * reference counts, to report Solutions with no supporting references
+Keys are any hashable node handle (LogicNode objects in the app, id strings in tools/lint.py).
+"""
+
+CYCLE = "cycle"
+ORPHAN = "orphan"
+UNRESOLVED = "unresolved"
+UNREFERENCED = "unreferenced"
+
+FINDING_LABELS = {
+    CYCLE: "Circular reasoning",
+    ORPHAN: "Orphan node (no arrows)",
+    UNRESOLVED: "Question without a Problem -> Solution path",
+    UNREFERENCED: "Solution without references",
+}
+
+
+class _Watched(set):
+    """Finding set that records, on its analyzer, each finding row an add / discard changes."""
+    __slots__ = ("owner", "row")
+
+    def __init__(self, owner, row):
+        super().__init__()
+        self.owner = owner
+        self.row = row
+
+    def add(self, key):
+        if key not in self:
+            set.add(self, key)
+            if self.owner.changes is not None: self.owner.changes.add((self.row, key))
+
+    def discard(self, key):
+        if key in self:
+            set.discard(self, key)
+            if self.owner.changes is not None: self.owner.changes.add((self.row, key))
+
+
+class ArgumentAnalyzer:
+    """
+    Findings are addressed as rows: (kind, key) for single-node findings, ("loop", key)
+    for self-loops and ("cycle", component id) for larger cycles. Once a view has called
+    take_changes, every later change records the rows it touched, so the view can update
+    just those rows.
+    """
+    def __init__(self):
+        self.types = {}
+        self.ref_counts = {}
+        self.succ = {}          # key -> {child: arrow count}
+        self.pred = {}          # key -> {parent: arrow count}
+        self.comp = {}          # key -> component id
+        self.members = {}       # component id -> set of keys
+        self.changes = None     # Finding rows changed since take_changes; None = not recording
+        self.cyclic = _Watched(self, "cycle")   # component ids with more than one member
+        self.self_loops = _Watched(self, "loop")
+        self.orphans = _Watched(self, ORPHAN)
+        self.reaches_solution = set()       # keys that can reach a Solution (itself included)
+        self.reaches_problem_fix = set()    # keys that can reach a Problem that reaches a Solution
+        self.unresolved = _Watched(self, UNRESOLVED)
+        self.unreferenced = _Watched(self, UNREFERENCED)
+        self.version = 0        # Bumped on every change, so views can skip redundant refreshes
+        self._next_comp = 0
+
+    # ------------------------------------------------------------ building
+    def load(self, nodes, edges):
+        """Bulk build from (key, type, ref_count) tuples and (parent, child) pairs in linear time."""
+        version = self.version
+        self.__init__()
+        self.version = version + 1
+        for key, node_type, ref_count in nodes:
+            self.types[key] = node_type
+            self.ref_counts[key] = ref_count
+            self.succ[key] = {}; self.pred[key] = {}
+        for u, v in edges:
+            if u not in self.types or v not in self.types: continue
+            self.succ[u][v] = self.succ[u].get(v, 0) + 1
+            self.pred[v][u] = self.pred[v].get(u, 0) + 1
+            if u == v: self.self_loops.add(u)
+        for comp in self._tarjan(self.types):
+            self._new_component(comp)
+        for key in self.types:
+            self._refresh_orphan(key)
+            self._refresh_unreferenced(key)
+        self._recompute_flags(set(self.types))
+
+    def add_nodes(self, nodes, edges):
+        """
+        Bulk insert of new (key, type, ref_count) nodes and (parent, child) arrows, e.g. an
+        import. Arrows between new nodes cost O(new) in total; any arrow that touches an
+        existing node goes through add_edge.
+        """
+        fresh = {}
+        for key, node_type, ref_count in nodes:
+            self.types[key] = node_type
+            self.ref_counts[key] = ref_count
+            self.succ[key] = {}; self.pred[key] = {}
+            fresh[key] = None
+        later = []
+        for u, v in edges:
+            if u not in fresh or v not in fresh:
+                later.append((u, v)); continue
+            self.succ[u][v] = self.succ[u].get(v, 0) + 1
+            self.pred[v][u] = self.pred[v].get(u, 0) + 1
+            if u == v: self.self_loops.add(u)
+        for comp in self._tarjan(fresh):
+            self._new_component(comp)
+        for key in fresh:
+            self._refresh_orphan(key)
+            self._refresh_unreferenced(key)
+        # No arrow leads from the new nodes to old ones yet, so they are closed under predecessors
+        self._recompute_flags(set(fresh))
+        self.version += 1
+        for u, v in later: self.add_edge(u, v)
+
+    def add_node(self, key, node_type, ref_count=0):
+        self.types[key] = node_type
+        self.ref_counts[key] = ref_count
+        self.succ[key] = {}; self.pred[key] = {}
+        self._new_component([key])
+        self.orphans.add(key)
+        self._refresh_unreferenced(key)
+        self._recompute_flags({key})
+        self.version += 1
+
+    def remove_node(self, key):
+        if key not in self.types: return
+        region = self._ancestors(self.pred[key]) # Everything that could reach through this node
+        for child in self.succ.pop(key):
+            del self.pred[child][key]
+            if child != key: self._refresh_orphan(child)
+        for parent in self.pred.pop(key):
+            if parent != key:
+                del self.succ[parent][key]; self._refresh_orphan(parent)
+        cid = self.comp.pop(key)
+        rest = self.members.pop(cid)
+        rest.discard(key)
+        if cid in self.cyclic:
+            self.cyclic.discard(cid); self._loops_changed(rest)
+        if rest: self._split_component(rest)
+        for s in (self.types, self.ref_counts):
+            s.pop(key)
+        for s in (self.self_loops, self.orphans, self.reaches_solution, self.reaches_problem_fix,
+                  self.unresolved, self.unreferenced):
+            s.discard(key)
+        region.discard(key)
+        self._recompute_flags(region)
+        self.version += 1
+
+    def set_type(self, key, node_type):
+        if self.types.get(key) == node_type: return
+        self.types[key] = node_type
+        self._refresh_unreferenced(key)
+        self._recompute_flags(self._ancestors([key]))
+        self.version += 1
+
+    def set_ref_count(self, key, ref_count):
+        if self.ref_counts.get(key) == ref_count: return
+        self.ref_counts[key] = ref_count
+        self._refresh_unreferenced(key)
+        self.version += 1
+
+    def add_edge(self, u, v):
+        kids = self.succ[u]
+        kids[v] = kids.get(v, 0) + 1
+        self.pred[v][u] = self.pred[v].get(u, 0) + 1
+        self.version += 1
+        if kids[v] > 1: return
+        self._refresh_orphan(u); self._refresh_orphan(v)
+        if u == v:
+            self.self_loops.add(u)
+        elif self.comp[u] != self.comp[v]:
+            self._merge_on_cycle(u, v)
+        # Reachability flags only grow when an arrow is added: push them upstream from u
+        if v in self.reaches_solution:
+            gained = self._propagate_up([u], self.reaches_solution)
+            seeds = [n for n in gained if self.types[n] == "Problem"]
+        else:
+            seeds = []
+        if v in self.reaches_problem_fix: seeds.append(u)
+        self._propagate_up(seeds, self.reaches_problem_fix)
+
+    def remove_edge(self, u, v):
+        kids = self.succ.get(u)
+        if not kids or v not in kids: return
+        self.version += 1
+        kids[v] -= 1
+        if kids[v] > 0: return
+        del kids[v]; del self.pred[v][u]
+        self._refresh_orphan(u); self._refresh_orphan(v)
+        if u == v:
+            self.self_loops.discard(u)
+        elif self.comp[u] == self.comp[v]:
+            cid = self.comp[u]
+            self.cyclic.discard(cid)
+            members = self.members.pop(cid)
+            self._loops_changed(members)
+            self._split_component(members)
+        self._recompute_flags(self._ancestors([u]))
+
+    # ------------------------------------------------------------ results
+    def status(self, key):
+        """Set of finding kinds that apply to one node."""
+        kinds = set()
+        if key in self.self_loops or self.comp.get(key) in self.cyclic: kinds.add(CYCLE)
+        if key in self.orphans: kinds.add(ORPHAN)
+        if key in self.unresolved: kinds.add(UNRESOLVED)
+        if key in self.unreferenced: kinds.add(UNREFERENCED)
+        return kinds
+
+    def flagged(self):
+        """Every node with at least one finding."""
+        keys = self.orphans | self.unresolved | self.unreferenced | self.self_loops
+        for cid in self.cyclic: keys |= self.members[cid]
+        return keys
+
+    def findings(self):
+        """List of (kind, keys) pairs; cycles list the whole component."""
+        return [self.finding(row) for row in self.rows()]
+
+    def rows(self):
+        """Ids of every current finding row, in findings() order."""
+        out = [("cycle", cid) for cid in self.cyclic]
+        out += [("loop", k) for k in self.self_loops if self.comp[k] not in self.cyclic]
+        out += [(UNRESOLVED, k) for k in self.unresolved]
+        out += [(UNREFERENCED, k) for k in self.unreferenced]
+        out += [(ORPHAN, k) for k in self.orphans]
+        return out
+
+    def finding(self, row):
+        """(kind, keys) of one finding row, or None when it does not apply (any more)."""
+        kind, ident = row
+        if kind == "cycle":
+            return (CYCLE, sorted_keys(self.members[ident])) if ident in self.cyclic else None
+        if kind == "loop":
+            return (CYCLE, [ident]) if ident in self.self_loops and self.comp[ident] not in self.cyclic else None
+        found = {ORPHAN: self.orphans, UNRESOLVED: self.unresolved, UNREFERENCED: self.unreferenced}[kind]
+        return (kind, [ident]) if ident in found else None
+
+    def take_changes(self):
+        """
+        Finding rows changed since the previous call, and starts recording the next batch.
+        None means "everything": the first call, and the first after load or stop_changes.
+        """
+        changes, self.changes = self.changes, set()
+        return changes
+
+    def stop_changes(self):
+        """Stops recording changes (no view is listening)."""
+        self.changes = None
+
+    def text_changed(self, key):
+        """The node's text is shown in its finding rows: marks them as changed."""
+        if key not in self.types: return
+        if self.changes is not None:
+            self.changes.update(((kind, key) for kind in (ORPHAN, UNRESOLVED, UNREFERENCED, "loop")))
+            self.changes.add(("cycle", self.comp[key]))
+        self.version += 1
+
+    # ------------------------------------------------------------ internals
+    def _refresh_orphan(self, key):
+        if self.succ[key] or self.pred[key]: self.orphans.discard(key)
+        else: self.orphans.add(key)
+
+    def _refresh_unreferenced(self, key):
+        if self.types[key] == "Solution" and not self.ref_counts[key]: self.unreferenced.add(key)
+        else: self.unreferenced.discard(key)
+
+    def _refresh_unresolved(self, key):
+        if self.types[key] == "Question" and key not in self.reaches_problem_fix: self.unresolved.add(key)
+        else: self.unresolved.discard(key)
+
+    def _new_component(self, keys):
+        cid = self._next_comp; self._next_comp += 1
+        self.members[cid] = set(keys)
+        for k in keys: self.comp[k] = cid
+        if len(keys) > 1:
+            self.cyclic.add(cid); self._loops_changed(keys)
+        return cid
+
+    def _loops_changed(self, keys):
+        """Self-loop rows are only listed outside cyclic components; keys' component changed."""
+        if self.changes is None or not self.self_loops: return
+        self.changes.update(("loop", k) for k in keys if k in self.self_loops)
+
+    def _merge_on_cycle(self, u, v):
+        """After adding u -> v: every node on a path v ~> u now shares a component with u."""
+        if not self.pred[u] or not self.succ[v]: return # u has no way back in
+        forward = self._descendants([v])
+        if u not in forward: return
+        on_cycle = {n for n in self._ancestors([u]) if n in forward}
+        cids = {self.comp[n] for n in on_cycle}
+        merged = set()
+        for cid in cids:
+            merged |= self.members.pop(cid)
+            self.cyclic.discard(cid)
+        self._new_component(merged)
+
+    def _split_component(self, keys):
+        """Re-runs Tarjan on the subgraph of one former component only."""
+        for comp in self._tarjan(keys):
+            self._new_component(comp)
+
+    def _tarjan(self, keys):
+        """Iterative Tarjan SCC restricted to `keys`."""
+        index, low, on_stack, stack, out = {}, {}, set(), [], []
+        counter = 0
+        for root in keys:
+            if root in index: continue
+            work = [(root, iter(self.succ[root]))]
+            index[root] = low[root] = counter; counter += 1
+            stack.append(root); on_stack.add(root)
+            while work:
+                node, it = work[-1]
+                for child in it:
+                    if child not in keys: continue
+                    if child not in index:
+                        index[child] = low[child] = counter; counter += 1
+                        stack.append(child); on_stack.add(child)
+                        work.append((child, iter(self.succ[child])))
+                        break
+                    if child in on_stack and index[child] < low[node]:
+                        low[node] = index[child]
+                else:
+                    work.pop()
+                    if work and low[node] < low[work[-1][0]]:
+                        low[work[-1][0]] = low[node]
+                    if low[node] == index[node]:
+                        comp = []
+                        while True:
+                            n = stack.pop(); on_stack.discard(n); comp.append(n)
+                            if n == node: break
+                        out.append(comp)
+        return out
+
+    def _walk(self, starts, adjacency):
+        seen = set(starts)
+        stack = list(seen)
+        while stack:
+            for nxt in adjacency[stack.pop()]:
+                if nxt not in seen:
+                    seen.add(nxt); stack.append(nxt)
+        return seen
+
+    def _descendants(self, starts): return self._walk(starts, self.succ)
+    def _ancestors(self, starts): return self._walk(starts, self.pred)
+
+    def _propagate_up(self, seeds, flags):
+        """Sets `flags` on seeds and their ancestors; returns the keys that gained the flag."""
+        gained = []
+        stack = [s for s in seeds if s not in flags]
+        for s in stack: flags.add(s)
+        while stack:
+            n = stack.pop()
+            gained.append(n)
+            if flags is self.reaches_problem_fix: self._refresh_unresolved(n)
+            for p in self.pred[n]:
+                if p not in flags:
+                    flags.add(p); stack.append(p)
+        return gained
+
+    def _recompute_flags(self, region):
+        """
+        Recomputes reachability flags for `region`, which must be closed under predecessors
+        (every ancestor of a region node is in the region). Flags outside it cannot change.
+        """
+        if not region: return
+        for flags, is_target in ((self.reaches_solution, lambda n: self.types[n] == "Solution"),
+                                 (self.reaches_problem_fix,
+                                  lambda n: self.types[n] == "Problem" and n in self.reaches_solution)):
+            flags.difference_update(region)
+            seeds = [n for n in region
+                     if is_target(n) or any(c in flags for c in self.succ[n] if c not in region)]
+            self._propagate_up(seeds, flags)
+        for n in region: self._refresh_unresolved(n)
+
+
+def sorted_keys(keys):
+    try: return sorted(keys)
+    except TypeError: return list(keys)
@@ -0,0 +1,92 @@
+# objects/bounds.py
+import heapq
+from itertools import count
+
+
+class ContentBounds:
+    """
+    Bounding box of a changing set of boxes, kept up to date incrementally.
+
+    Each edge (min x1, min y1, max x2, max y2) is a heap with lazy deletion: an update
+    pushes the new box and leaves the old entries behind, and stale entries are popped
+    only when they reach the top. Heaps are rebuilt when the entries pushed since the last
+    rebuild outnumber the live boxes (checked on the largest heap, since bbox only pops some
+    of them), so set / discard / bbox are amortized O(log n) and memory stays O(n).
+
+    Boxes are stored in reference coordinates under one affine transform
+    (canvas = ref * scale + offset), so zooming the canvas is O(1) here as well.
+    Works on any hashable keys (LogicNode objects in the app).
+    """
+    def __init__(self):
+        self.boxes = {}  # key -> (ref box, sequence number of its live heap entries)
+        self.scale = 1.0
+        self.ox = self.oy = 0.0
+        self._seq = count()
+        self._clear_heaps()
+
+    def _clear_heaps(self):
+        # Max edges are stored negated; the sequence number breaks ties and marks liveness
+        self._x1, self._y1, self._x2, self._y2 = [], [], [], []
+        self._entries = 0 # Upper bound of every heap's length: pops only make them shorter
+
+    def set(self, key, box):
+        """Adds or updates the canvas box (x1, y1, x2, y2) of `key`."""
+        s = self.scale
+        x1, y1 = (box[0] - self.ox) / s, (box[1] - self.oy) / s
+        x2, y2 = (box[2] - self.ox) / s, (box[3] - self.oy) / s
+        seq = next(self._seq)
+        self.boxes[key] = ((x1, y1, x2, y2), seq)
+        heapq.heappush(self._x1, (x1, seq, key))
+        heapq.heappush(self._y1, (y1, seq, key))
+        heapq.heappush(self._x2, (-x2, seq, key))
+        heapq.heappush(self._y2, (-y2, seq, key))
+        self._entries += 1
+        if self._entries > 2 * len(self.boxes) + 64: self._compact()
+
+    def discard(self, key):
+        if self.boxes.pop(key, None) is not None and self._entries > 2 * len(self.boxes) + 64:
+            self._compact()
+
+    def clear(self):
+        self.boxes.clear(); self._clear_heaps()
+
+    def scaled(self, ox, oy, factor):
+        """Mirrors canvas.scale(..., ox, oy, factor, factor) applied to every box."""
+        self.scale *= factor
+        self.ox = ox + (self.ox - ox) * factor
+        self.oy = oy + (self.oy - oy) * factor
+
+    def to_canvas(self, x, y):
+        return x * self.scale + self.ox, y * self.scale + self.oy
+
+    def to_ref(self, x, y):
+        """Canvas point in reference coordinates, which zooming does not change."""
+        return (x - self.ox) / self.scale, (y - self.oy) / self.scale
+
+    def bbox(self):
+        """Canvas bounding box of all boxes, or None when there are none."""
+        box = self.ref_bbox()
+        if box is None: return None
+        s = self.scale
+        return (box[0] * s + self.ox, box[1] * s + self.oy, box[2] * s + self.ox, box[3] * s + self.oy)
+
+    def ref_bbox(self):
+        """Bounding box of all boxes in reference coordinates, or None when there are none."""
+        if not self.boxes: return None
+        return self._top(self._x1), self._top(self._y1), -self._top(self._x2), -self._top(self._y2)
+
+    def _top(self, heap):
+        boxes = self.boxes
+        while True:
+            value, seq, key = heap[0]
+            live = boxes.get(key)
+            if live is not None and live[1] == seq: return value
+            heapq.heappop(heap)
+
+    def _compact(self):
+        self._clear_heaps()
+        for key, ((x1, y1, x2, y2), seq) in self.boxes.items():
+            self._x1.append((x1, seq, key)); self._y1.append((y1, seq, key))
+            self._x2.append((-x2, seq, key)); self._y2.append((-y2, seq, key))
+        for heap in (self._x1, self._y1, self._x2, self._y2): heapq.heapify(heap)
+        self._entries = len(self.boxes)
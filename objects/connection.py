@@ -1,68 +1,95 @@
 # objects/connection.py
-import tkinter as tk
 from constants import COLORS
 
+# Tcl lambda behind Connection.draw_many: one arrow per four coordinates
+_DRAW_MANY = """{w fill data} {
+    set ids {}
+    foreach {px py cx cy} $data {
+        lappend ids [$w create line $px $py $cx $cy -arrow last -width 2 -fill $fill \\
+            -tags connection -activefill blue]
+    }
+    return $ids
+}"""
+
+def route_arrow(parent_box, child_box):
+    """
+    Returns (px, py, cx, cy): the arrow from parent to child, anchored on their closest sides.
+    Boxes are (x1, y1, x2, y2); this is shared by the canvas and the headless exporters.
+    """
+    # 1. Get centers of both nodes
+    pcx, pcy = (parent_box[0] + parent_box[2]) / 2, (parent_box[1] + parent_box[3]) / 2
+    ccx, ccy = (child_box[0] + child_box[2]) / 2, (child_box[1] + child_box[3]) / 2
+    
+    # 2. Calculate distance vector
+    dx = ccx - pcx
+    dy = ccy - pcy
+    
+    # 3. Determine Anchor Points (Smart Routing)
+    # If horizontal distance is larger, connect Left/Right sides.
+    # Otherwise, connect Top/Bottom sides.
+    if abs(dx) > abs(dy):
+        if dx > 0: # Child is to the RIGHT of Parent
+            return parent_box[2], pcy, child_box[0], ccy
+        return parent_box[0], pcy, child_box[2], ccy
+    if dy > 0: # Child is BELOW Parent
+        return pcx, parent_box[3], ccx, child_box[1]
+    return pcx, parent_box[1], ccx, child_box[3]
+
 class Connection:
     """
     Represents a directional link (Arrow) between two nodes.
     It dynamically calculates start/end points based on relative positions.
     """
-    def __init__(self, app, parent_node, child_node):
+    __slots__ = ("app", "parent", "child", "line_id")
+
+    def __init__(self, app, parent_node, child_node, draw=True):
         self.app = app
         self.parent = parent_node
         self.child = child_node
         self.line_id = None
-        self.draw()
+        if draw: self.draw()
 
     def draw(self):
         """Calculates geometry to connect the closest sides of parent and child."""
-        # 1. Get centers of both nodes
-        pcx, pcy = self.parent.get_center()
-        ccx, ccy = self.child.get_center()
+        if self.parent.hidden or self.child.hidden:
+            # An end sits inside a collapsed subtree: keep no canvas item at all
+            self.delete(); return
+        px, py, cx, cy = route_arrow(self.parent.get_box(), self.child.get_box())
         
-        # 2. Calculate distance vector
-        dx = ccx - pcx
-        dy = ccy - pcy
-        
-        px, py = 0, 0
-        cx, cy = 0, 0
-        
-        # 3. Determine Anchor Points (Smart Routing)
-        # If horizontal distance is larger, connect Left/Right sides.
-        # Otherwise, connect Top/Bottom sides.
-        if abs(dx) > abs(dy):
-            # Horizontal connection
-            if dx > 0: # Child is to the RIGHT of Parent
-                px, py = self.parent.get_anchor("Right")
-                cx, cy = self.child.get_anchor("Left")
-            else:      # Child is to the LEFT of Parent
-                px, py = self.parent.get_anchor("Left")
-                cx, cy = self.child.get_anchor("Right")
-        else:
-            # Vertical connection
-            if dy > 0: # Child is BELOW Parent
-                px, py = self.parent.get_anchor("Bottom")
-                cx, cy = self.child.get_anchor("Top")
-            else:      # Child is ABOVE Parent
-                px, py = self.parent.get_anchor("Top")
-                cx, cy = self.child.get_anchor("Bottom")
-        
-        # 4. Draw or Update the Line on Canvas
+        # Draw or Update the Line on Canvas
         if self.line_id is None:
             self.line_id = self.app.canvas.create_line(
                 px, py, cx, cy,
-                arrow=tk.LAST, width=2, fill=COLORS["LineDefault"], 
+                arrow="last", width=2, fill=COLORS["LineDefault"], 
                 tags="connection", activefill="blue" # Highlights blue on hover
             )
         else:
             self.app.canvas.coords(self.line_id, px, py, cx, cy)
             
+    @staticmethod
+    def draw_many(app, conns):
+        """
+        Creates the lines of freshly built, undrawn connections in one Tcl call.
+        Routes come from the nodes' stored geometry (LogicNode.model_box), so this makes
+        no per-arrow coords queries either; arrows with a hidden end stay undrawn.
+        """
+        shown = [c for c in conns if not (c.parent.hidden or c.child.hidden)]
+        if not shown: return
+        data = []
+        for c in shown: data.extend(route_arrow(c.parent.model_box(), c.child.model_box()))
+        tk_ = app.canvas.tk
+        item_ids = tk_.splitlist(tk_.call("apply", _DRAW_MANY, str(app.canvas), COLORS["LineDefault"], tuple(data)))
+        for c, item in zip(shown, item_ids): c.line_id = int(item)
+
     def set_selected(self, selected=True):
         """Visual feedback when arrow is clicked."""
         color = COLORS["LineSelected"] if selected else COLORS["LineDefault"]
         width = 4 if selected else 2 # Make it thicker when selected
+        if self.line_id is None: return
         self.app.canvas.itemconfig(self.line_id, fill=color, width=width)
 
     def delete(self):
         """Remove arrow from canvas."""
-        self.app.canvas.delete(self.line_id)
\ No newline at end of file
+        if self.line_id is not None:
+            self.app.canvas.delete(self.line_id)
+            self.line_id = None
\ No newline at end of file
@@ -0,0 +1,76 @@
+# objects/graph.py
+
+
+class ReachabilityIndex:
+    """
+    Directed graph of arrows with cached descendant sets.
+    Only queried nodes are cached; arrow additions extend the affected caches in place,
+    and arrow removals drop only the caches that could have reached through that arrow.
+    Works on any hashable node keys (LogicNode objects in the app).
+    """
+    def __init__(self):
+        self.children = {}  # node -> {child: arrow count}
+        self.parents = {}   # node -> {parent: arrow count}
+        self._desc = {}     # node -> set of descendants (cache)
+
+    def add_edge(self, parent, child):
+        kids = self.children.setdefault(parent, {})
+        kids[child] = kids.get(child, 0) + 1
+        ups = self.parents.setdefault(child, {})
+        ups[parent] = ups.get(parent, 0) + 1
+        if kids[child] > 1 or not self._desc: return
+        affected = [d for a, d in self._desc.items() if a is parent or parent in d]
+        if affected:
+            gained = self._walk(child)
+            gained.add(child)
+            for d in affected: d |= gained
+
+    def add_edges(self, edges):
+        """Bulk insert: drops the descendant caches once instead of extending them per arrow."""
+        self._desc.clear()
+        for parent, child in edges:
+            kids = self.children.setdefault(parent, {})
+            kids[child] = kids.get(child, 0) + 1
+            ups = self.parents.setdefault(child, {})
+            ups[parent] = ups.get(parent, 0) + 1
+
+    def remove_edge(self, parent, child):
+        kids = self.children.get(parent)
+        if not kids or child not in kids: return
+        kids[child] -= 1
+        if kids[child] > 0: return
+        del kids[child]
+        ups = self.parents[child]
+        del ups[parent]
+        # Anything that could reach `parent` may have lost descendants; recompute lazily
+        stale = [a for a, d in self._desc.items() if a is parent or parent in d]
+        for a in stale: del self._desc[a]
+
+    def remove_node(self, node):
+        for child in list(self.children.get(node, ())):
+            while child in self.children.get(node, ()): self.remove_edge(node, child)
+        for parent in list(self.parents.get(node, ())):
+            while node in self.children.get(parent, ()): self.remove_edge(parent, node)
+        self.children.pop(node, None)
+        self.parents.pop(node, None)
+        self._desc.pop(node, None)
+
+    def descendants(self, node):
+        """All nodes reachable from `node` through arrows (includes `node` only on a cycle)."""
+        d = self._desc.get(node)
+        if d is None:
+            d = self._desc[node] = self._walk(node)
+        return d
+
+    def _walk(self, start):
+        seen = set()
+        stack = list(self.children.get(start, ()))
+        while stack:
+            n = stack.pop()
+            if n in seen: continue
+            seen.add(n)
+            stack.extend(k for k in self.children.get(n, ()) if k not in seen)
+        return seen
+
+    def clear(self):
+        self.children.clear(); self.parents.clear(); self._desc.clear()
@@ -0,0 +1,87 @@
+# objects/model.py
+"""
+Compact building blocks shared by the model objects.
+
+Nodes and references carry a small integer id. The UUID strings used in project files
+and attachment folders live in a packed registry (16 bytes per id) and are only turned
+into strings at XML I/O, instead of every object holding a 36-character string.
+Each open project has its own registry, and every object keeps a reference to the one
+that issued its id, so ids never resolve against another project's registry.
+"""
+import uuid
+
+_UNSET = bytes(16)
+
+
+class IdRegistry:
+    """
+    Maps compact integer ids to UUIDs for one project. UUIDs of new objects are generated
+    on first use; ids released by deleted objects are handed out again.
+    """
+    def __init__(self):
+        self._uuids = bytearray()  # 16 bytes per id; all zero = not assigned yet
+        self._custom = {}          # id -> original text for ids that are not canonical UUIDs
+        self._free = []            # Released ids, reused before the array grows
+
+    def __len__(self):
+        return len(self._uuids) // 16 - len(self._free)
+
+    def new_id(self):
+        if self._free: return self._free.pop()
+        i = len(self._uuids) // 16
+        self._uuids += _UNSET
+        return i
+
+    def from_uuid(self, text):
+        """Registers an id read from a file and returns its compact id."""
+        i = self.new_id()
+        try:
+            u = uuid.UUID(text)
+        except (ValueError, TypeError, AttributeError):
+            u = None
+        if u is not None and str(u) == text:
+            self._uuids[i * 16:(i + 1) * 16] = u.bytes
+        else:
+            # Keep non-canonical ids byte for byte so files round-trip unchanged
+            self._custom[i] = text
+        return i
+
+    def to_uuid(self, i):
+        text = self._custom.get(i)
+        if text is not None: return text
+        raw = bytes(self._uuids[i * 16:(i + 1) * 16])
+        if raw == _UNSET:
+            raw = uuid.uuid4().bytes
+            self._uuids[i * 16:(i + 1) * 16] = raw
+        return str(uuid.UUID(bytes=raw))
+
+    def release(self, i):
+        """Frees the id of a deleted object."""
+        self._uuids[i * 16:(i + 1) * 16] = _UNSET
+        self._custom.pop(i, None)
+        self._free.append(i)
+
+
+class Reference:
+    """One bibliography entry attached to a node."""
+    __slots__ = ("registry", "id", "title", "link", "file", "desc")
+
+    def __init__(self, registry, title="", link="", file="", desc="", ref_id=None):
+        self.registry = registry
+        self.id = registry.new_id() if ref_id is None else ref_id
+        self.title = title
+        self.link = link
+        self.file = file
+        self.desc = desc
+
+    @property
+    def uuid(self): return self.registry.to_uuid(self.id)
+
+    @classmethod
+    def from_record(cls, registry, rec):
+        """Builds a reference from a project_file record (a dict with a UUID string id)."""
+        return cls(registry, rec.get('title', ''), rec.get('link', ''), rec.get('file', '') or '', rec.get('desc', ''),
+                   ref_id=registry.from_uuid(rec['id']))
+
+    def to_record(self):
+        return {'id': self.uuid, 'title': self.title, 'link': self.link, 'file': self.file, 'desc': self.desc}
@@ -1,14 +1,37 @@
 # objects/node.py
+import sys
 import tkinter as tk
-import uuid
 from constants import COLORS, BASE_NODE_WIDTH, BASE_NODE_HEIGHT, BASE_FONT_SIZE
+from objects.text_layout import layout_cache
+
+# Tcl lambda behind LogicNode.draw_many: one rectangle and two texts per 15 fields
+_DRAW_MANY = """{w data} {
+    set ids {}
+    foreach {x1 y1 x2 y2 fill dash tag tx ty text font lx ly label lfont} $data {
+        lappend ids [$w create rectangle $x1 $y1 $x2 $y2 -fill $fill -outline black -width 1 \\
+            -dash $dash -tags [list node $tag]]
+        lappend ids [$w create text $tx $ty -text $text -justify center \\
+            -font $font -tags [list node text_content $tag]]
+        lappend ids [$w create text $lx $ly -text $label -font $lfont -fill #555 \\
+            -tags [list node text_label $tag]]
+    }
+    return $ids
+}"""
 
 class LogicNode:
-    def __init__(self, app, x, y, node_type, text="New Node", node_id=None, width=None, height=None):
+    # Slotted: no per-instance __dict__, which matters on 100k-node maps
+    __slots__ = ("app", "registry", "_node_type", "text", "references", "x", "y", "width", "height", "id",
+                 "rect_id", "text_id", "type_id", "handle_id", "badge_ids", "shown_layout",
+                 "hidden", "collapsed", "flagged")
+
+    def __init__(self, app, x, y, node_type, text="New Node", node_id=None, width=None, height=None, draw=True,
+                 registry=None):
         self.app = app
+        # The project's objects.model.IdRegistry; node_id, if given, must come from it
+        self.registry = app.ids if registry is None else registry
         self.node_type = node_type
         self.text = text
-        self.references = [] 
+        self.references = [] # [objects.model.Reference]
         self.x = x
         self.y = y
         
@@ -16,52 +39,141 @@ class LogicNode:
         self.width = int(width) if width else BASE_NODE_WIDTH
         self.height = int(height) if height else BASE_NODE_HEIGHT
         
-        self.id = node_id if node_id else str(uuid.uuid4())
+        # Compact id; the UUID string only exists at XML I/O (see objects.model.IdRegistry)
+        self.id = self.registry.new_id() if node_id is None else node_id
         
         self.rect_id = None
         self.text_id = None
         self.type_id = None
         self.handle_id = None 
+        self.badge_ids = None # (oval, count text) while the subtree is collapsed
+        self.shown_layout = None # (display, wrap, font size) last sent to the canvas
+        self.hidden = False # Inside a collapsed subtree: no canvas items exist
+        self.collapsed = False
+        self.flagged = False # Has an open finding in the structure check (dashed outline)
         
-        self.draw()
+        if draw: self.draw()
 
-    def draw(self):
+    @property
+    def node_type(self): return self._node_type
+
+    @node_type.setter
+    def node_type(self, value):
+        # One shared string per type instead of one copy per node read from XML
+        self._node_type = sys.intern(value) if value else value
+
+    @property
+    def uuid(self): return self.registry.to_uuid(self.id)
+
+    @property
+    def tag(self):
+        """Canvas tag shared by all items of this node (pure numbers would be read as item ids)."""
+        return f"n{self.id}"
+
+    def _draw_args(self):
+        """Geometry and style of the box, text and type label, in _DRAW_MANY field order."""
         z = self.app.zoom_level
         w = self.width * z
         h = self.height * z
-        f_size = int(BASE_FONT_SIZE * z)
         
         color = COLORS.get(self.node_type, "white")
+        self.shown_layout = self.text_layout()
+        display, _, f_size = self.shown_layout
+        return (self.x, self.y, self.x + w, self.y + h, color, (6, 3) if self.flagged else "", self.tag,
+                self.x + w/2, self.y + h/2, display, ("Arial", f_size),
+                self.x + w/2, self.y + (10 * z), f"[{self.node_type}]", ("Arial", int(f_size*0.8), "bold"))
+
+    def draw(self):
+        (x1, y1, x2, y2, color, dash, tag, tx, ty, display, font,
+         lx, ly, label, label_font) = self._draw_args()
         
         self.rect_id = self.app.canvas.create_rectangle(
-            self.x, self.y, self.x + w, self.y + h,
-            fill=color, outline="black", width=1, tags=("node", self.id)
+            x1, y1, x2, y2,
+            fill=color, outline="black", width=1, tags=("node", tag),
+            dash=dash
         )
         
         self.text_id = self.app.canvas.create_text(
-            self.x + w/2, self.y + h/2,
-            text=self.text,
-            width=w - (10 * z), # Initial Wrap Width
+            tx, ty,
+            text=display, # Already wrapped by text_layout; no Tk -width, so Tk never re-wraps it
             justify="center",
-            font=("Arial", f_size), tags=("node", "text_content", self.id)
+            font=font, tags=("node", "text_content", tag)
         )
         
         self.type_id = self.app.canvas.create_text(
-            self.x + w/2, self.y + (10 * z),
-            text=f"[{self.node_type}]", font=("Arial", int(f_size*0.8), "bold"), 
-            fill="#555", tags=("node", "text_label", self.id)
+            lx, ly,
+            text=label, font=label_font, 
+            fill="#555", tags=("node", "text_label", tag)
         )
+        self.hidden = False
 
-    # --- NEW METHOD: Force Text to Wrap Correctly ---
-    def update_text_wrapping(self):
-        """Recalculates the text wrapping limit based on current zoom."""
+    @staticmethod
+    def draw_many(app, nodes):
+        """
+        Same items as `draw` for many nodes, created by a single Tcl call instead of three
+        Python -> Tk round trips per node. Field values travel as Tcl list elements, so
+        node text needs no quoting.
+        """
+        data = []
+        for node in nodes: data.extend(node._draw_args())
+        if not data: return
+        tk_ = app.canvas.tk
+        item_ids = tk_.splitlist(tk_.call("apply", _DRAW_MANY, str(app.canvas), tuple(data)))
+        for i, node in enumerate(nodes):
+            node.rect_id, node.text_id, node.type_id = (int(v) for v in item_ids[3 * i:3 * i + 3])
+            node.hidden = False
+
+    def model_box(self):
+        """Canvas box computed from the stored position; no Tk round trip (see sync_coords)."""
+        z = self.app.zoom_level
+        return (self.x, self.y, self.x + self.width * z, self.y + self.height * z)
+
+    def release(self):
+        """Deletes every canvas item of this node; `draw` brings them back."""
+        for item in (self.rect_id, self.text_id, self.type_id, self.handle_id):
+            if item: self.app.canvas.delete(item)
+        self.clear_badge()
+        self.rect_id = self.text_id = self.type_id = self.handle_id = None
+        self.shown_layout = None
+        self.hidden = True
+
+    def draw_badge(self, count):
+        """Shows how many descendants are hidden under this collapsed node."""
+        self.clear_badge()
+        z = self.app.zoom_level
+        r = 9 * z
+        bx, by = self.x + self.width * z, self.y
+        oval = self.app.canvas.create_oval(bx - r, by - r, bx + r, by + r, fill=COLORS["Selected"],
+                                           outline="white", tags=("node", "badge", self.tag))
+        label = self.app.canvas.create_text(bx, by, text=f"+{count}", fill="white",
+                                            font=("Arial", max(1, int(BASE_FONT_SIZE * z * 0.8)), "bold"),
+                                            tags=("node", "badge", self.tag))
+        self.badge_ids = (oval, label, count)
+
+    def clear_badge(self):
+        if self.badge_ids:
+            self.app.canvas.delete(self.badge_ids[0]); self.app.canvas.delete(self.badge_ids[1])
+            self.badge_ids = None
+
+    def text_layout(self):
+        """Returns (display excerpt, wrap width, font size) for the current size and zoom."""
         z = self.app.zoom_level
-        # Calculate visual width of the box
-        visual_width = self.width * z
         # Set wrap limit (Box Width - Padding)
-        wrap_limit = max(10, visual_width - (10 * z))
-        
-        self.app.canvas.itemconfig(self.text_id, width=wrap_limit)
+        wrap_limit = max(10, int(self.width * z - (10 * z)))
+        f_size = max(1, int(BASE_FONT_SIZE * z))
+        # Leave room for the [Type] label at the top of the box
+        avail_height = self.height * z - (16 * z)
+        display = layout_cache.layout(self.text, wrap_limit, f_size, avail_height)
+        return display, wrap_limit, f_size
+
+    # --- NEW METHOD: Force Text to Wrap Correctly ---
+    def update_text_wrapping(self):
+        """Sends the cached excerpt to the canvas; its line breaks are drawn as they are."""
+        layout = self.text_layout()
+        if layout == self.shown_layout: return
+        self.shown_layout = layout
+        display, _, f_size = layout
+        self.app.canvas.itemconfig(self.text_id, text=display, font=("Arial", f_size))
     # -----------------------------------------------
 
     def draw_handle(self):
@@ -76,7 +188,7 @@ class LogicNode:
         self.handle_id = self.app.canvas.create_rectangle(
             self.x + w - size, self.y + h - size,
             self.x + w, self.y + h,
-            fill=COLORS["Handle"], outline="black", tags=("resize_grip", self.id)
+            fill=COLORS["Handle"], outline="black", tags=("resize_grip", self.tag)
         )
 
     def resize(self, new_width, new_height):
@@ -101,10 +213,13 @@ class LogicNode:
         
         if self.handle_id:
             self.draw_handle()
+        if self.badge_ids:
+            self.draw_badge(self.badge_ids[2])
             
-        self.app.update_connections(self)
+        self.app.node_geometry_changed(self)
 
     def set_selected(self, selected=True):
+        if self.hidden: return
         color = COLORS["Selected"] if selected else "black"
         width = 2 if selected else 1
         self.app.canvas.itemconfig(self.rect_id, outline=color, width=width)
@@ -117,12 +232,22 @@ class LogicNode:
                 self.app.canvas.delete(self.handle_id)
                 self.handle_id = None
 
+    def set_flagged(self, flagged=True):
+        self.flagged = flagged
+        if not self.hidden:
+            self.app.canvas.itemconfig(self.rect_id, dash=(6, 3) if flagged else "")
+
     def sync_coords(self):
         coords = self.app.canvas.coords(self.rect_id)
         if coords:
             self.x = coords[0]
             self.y = coords[1]
 
+    def get_box(self):
+        coords = self.app.canvas.coords(self.rect_id)
+        if not coords: return (self.x, self.y, self.x, self.y)
+        return tuple(coords)
+
     def get_center(self):
         coords = self.app.canvas.coords(self.rect_id)
         if not coords: return (self.x, self.y)
@@ -146,13 +271,15 @@ class LogicNode:
             self.app.canvas.move(item, dx, dy)
         if self.handle_id:
             self.app.canvas.move(self.handle_id, dx, dy)
+        if self.badge_ids:
+            self.app.canvas.move(self.badge_ids[0], dx, dy); self.app.canvas.move(self.badge_ids[1], dx, dy)
         
         self.x += dx
         self.y += dy
-        self.app.update_connections(self)
+        self.app.node_geometry_changed(self)
 
     def update_visuals(self):
-        self.app.canvas.itemconfig(self.text_id, text=self.text)
+        self.update_text_wrapping()
         color = COLORS.get(self.node_type, "white")
         self.app.canvas.itemconfig(self.rect_id, fill=color)
         self.app.canvas.itemconfig(self.type_id, text=f"[{self.node_type}]")
\ No newline at end of file
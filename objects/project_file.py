@@ -0,0 +1,116 @@
+# objects/project_file.py
+"""
+Headless reading and writing of ThesisFlow XML projects.
+Works on plain records (dicts), so tools can process a map without Tk.
+"""
+import json
+import os
+import uuid
+import xml.etree.ElementTree as ET
+
+from constants import BASE_NODE_WIDTH, BASE_NODE_HEIGHT, SNAPSHOT_PATH
+
+
+def read_project(path):
+    """
+    Parses a project file into:
+        {'project_id': str,
+         'nodes': [{'id', 'type', 'x', 'y', 'w', 'h', 'text', 'collapsed', 'references': [ref dicts]}],
+         'links': [(parent_id, child_id)]}
+    Coordinates are in model units (zoom 1.0), exactly as stored on disk.
+    """
+    root = ET.parse(path).getroot()
+    project = {'project_id': root.get('project_id', str(uuid.uuid4())), 'nodes': [], 'links': []}
+
+    for ne in root.findall("Node"):
+        text_el = ne.find("Text")
+        node = {
+            'id': ne.get('id'),
+            'type': ne.get('type'),
+            'x': float(ne.get('x')),
+            'y': float(ne.get('y')),
+            'w': float(ne.get('w')) if ne.get('w') else BASE_NODE_WIDTH,
+            'h': float(ne.get('h')) if ne.get('h') else BASE_NODE_HEIGHT,
+            'text': (text_el.text if text_el is not None else "") or "",
+            'collapsed': ne.get('collapsed') == "1",
+            'references': [],
+        }
+        ref_container = ne.find("References")
+        if ref_container is not None:
+            for r_xml in ref_container.findall("Ref"):
+                node['references'].append({
+                    'id': r_xml.get('id', str(uuid.uuid4())),
+                    'title': _child_text(r_xml, "Title"),
+                    'link': _child_text(r_xml, "Link"),
+                    'file': _child_text(r_xml, "File"),
+                    'desc': _child_text(r_xml, "Desc"),
+                })
+        project['nodes'].append(node)
+
+    conn_root = root.find("Connections")
+    if conn_root is not None:
+        for link in conn_root.findall("Link"):
+            project['links'].append((link.get("parent"), link.get("child")))
+    return project
+
+
+def _child_text(element, tag):
+    child = element.find(tag)
+    return (child.text if child is not None else "") or ""
+
+
+def write_project(path, project):
+    """Writes a project record (same shape as read_project returns) as XML."""
+    root = ET.Element("ThesisFlow", project_id=project['project_id'])
+    for n in project['nodes']:
+        ne = ET.SubElement(root, "Node", id=n['id'], type=n['type'],
+                           x=str(n['x']), y=str(n['y']), w=str(n['w']), h=str(n['h']))
+        if n.get('collapsed'): ne.set("collapsed", "1")
+        ET.SubElement(ne, "Text").text = n['text']
+        re = ET.SubElement(ne, "References")
+        for ref in n['references']:
+            r_item = ET.SubElement(re, "Ref", id=ref['id'])
+            ET.SubElement(r_item, "Title").text = ref.get('title', '')
+            ET.SubElement(r_item, "Link").text = ref.get('link', '')
+            ET.SubElement(r_item, "File").text = ref.get('file', '')
+            ET.SubElement(r_item, "Desc").text = ref.get('desc', '')
+
+    ce_root = ET.SubElement(root, "Connections")
+    for pid, cid in project['links']:
+        ET.SubElement(ce_root, "Link", parent=pid, child=cid)
+    ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+
+
+# --- Last-project snapshot (fast reopen at startup) ---
+def write_snapshot(project, source_path, snapshot_path=SNAPSHOT_PATH):
+    """
+    Caches the records of `source_path` as JSON, tagged with the file's mtime and size.
+    Reading JSON back is much cheaper than re-parsing and walking the XML tree.
+    """
+    st = os.stat(source_path)
+    data = {'source': os.path.abspath(source_path), 'mtime': st.st_mtime_ns, 'size': st.st_size,
+            'project': project}
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+    tmp = snapshot_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, snapshot_path)
+
+
+def read_snapshot(snapshot_path=SNAPSHOT_PATH):
+    """
+    Returns (source_path, project). `project` is None when the source file changed since
+    the snapshot was taken (parse the XML instead); both are None when there is nothing to reopen.
+    """
+    try:
+        with open(snapshot_path, encoding="utf-8") as f:
+            data = json.load(f)
+        source = data['source']
+        st = os.stat(source)
+    except (OSError, ValueError, KeyError):
+        return None, None
+    if st.st_mtime_ns != data.get('mtime') or st.st_size != data.get('size'):
+        return source, None
+    project = data['project']
+    project['links'] = [tuple(link) for link in project['links']]
+    return source, project
@@ -0,0 +1,114 @@
+# objects/text_layout.py
+from collections import OrderedDict
+
+ELLIPSIS = "…"
+
+
+def wrap_lines(text, wrap_width, max_lines, measure):
+    """
+    Greedy word wrap that stops as soon as `max_lines` lines are filled.
+    Only the visible part of the text is ever measured, so a node holding
+    pages of pasted text costs the same as one holding a single sentence.
+    Leading indentation is kept; whitespace is only dropped at the end of a line.
+    Returns (lines, truncated).
+    """
+    lines = []
+    pos, end = 0, len(text)
+    while pos <= end:
+        nl = text.find("\n", pos)
+        if nl == -1: nl = end
+        words = text[pos:nl].rstrip(" ").split(" ")
+        current, wrapped = None, False
+        for word in words:
+            if wrapped and current is None and not word: continue
+            candidate = word if current is None else f"{current} {word}"
+            if measure(candidate) <= wrap_width:
+                current = candidate; continue
+            if current is not None and current.strip():
+                lines.append(current.rstrip(" "))
+                if len(lines) >= max_lines: return lines, True
+                if not word: # Spaces at a wrap point are dropped, not carried to the next line
+                    current, wrapped = None, True; continue
+            elif current is not None:
+                word = f"{current} {word}" # Indentation alone is not a line; it stays with the word
+            # Words wider than the box are broken by characters
+            while measure(word) > wrap_width and len(word) > 1:
+                cut = _fit_prefix(word, wrap_width, measure)
+                lines.append(word[:cut].rstrip(" "))
+                if len(lines) >= max_lines: return lines, True
+                word = word[cut:]
+            current = word
+        lines.append(current)
+        pos = nl + 1
+        if len(lines) >= max_lines:
+            return lines, pos < end
+    return lines, False
+
+
+def _fit_prefix(word, wrap_width, measure):
+    """Longest prefix length (at least 1) of `word` that fits in `wrap_width`."""
+    lo, hi = 1, len(word)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if measure(word[:mid]) <= wrap_width: lo = mid
+        else: hi = mid - 1
+    return lo
+
+
+def add_ellipsis(line, wrap_width, measure):
+    """Trims `line` until it fits together with a trailing ellipsis."""
+    line = line.rstrip()
+    while line and measure(line + ELLIPSIS) > wrap_width:
+        line = line[:-1].rstrip()
+    return line + ELLIPSIS
+
+
+def layout_text(text, wrap_width, max_lines, measure):
+    """Display excerpt of `text`: wrapped to `wrap_width`, cut to `max_lines` with an ellipsis."""
+    lines, truncated = wrap_lines(text, wrap_width, max(1, max_lines), measure)
+    if truncated:
+        lines[-1] = add_ellipsis(lines[-1], wrap_width, measure)
+    return "\n".join(lines)
+
+
+class TextLayoutCache:
+    """
+    LRU cache of display excerpts keyed by (text, wrap width, font size, line budget).
+    Fonts are created lazily so the module can be imported before Tk starts.
+    """
+    def __init__(self, family="Arial", maxsize=4096):
+        self.family = family
+        self.maxsize = maxsize
+        self._fonts = {}
+        self._cache = OrderedDict()
+
+    def _font(self, size):
+        entry = self._fonts.get(size)
+        if entry is None:
+            from tkinter import font as tkfont
+            font = tkfont.Font(family=self.family, size=size)
+            entry = self._fonts[size] = (font, font.metrics("linespace"))
+        return entry
+
+    def layout(self, text, wrap_width, font_size, avail_height):
+        """Returns the excerpt of `text` that fits a `wrap_width` x `avail_height` box."""
+        font_size = max(1, int(font_size))
+        font, linespace = self._font(font_size)
+        wrap_width = int(wrap_width)
+        max_lines = max(1, int(avail_height // linespace))
+        key = (text, wrap_width, font_size, max_lines)
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+            return hit
+        display = layout_text(text, wrap_width, max_lines, font.measure)
+        self._cache[key] = display
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return display
+
+    def clear(self):
+        self._cache.clear()
+
+
+layout_cache = TextLayoutCache()
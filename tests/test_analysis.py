@@ -0,0 +1,110 @@
+# tests/test_analysis.py
+import random
+
+from objects.analysis import ArgumentAnalyzer
+
+TYPES = ["Question", "Problem", "Solution", "Explanation", "Conclusion"]
+
+
+def state(a):
+    """Everything findings() is derived from, with component ids replaced by their members."""
+    return (a.types, a.ref_counts, a.orphans, a.unresolved, a.unreferenced, a.self_loops,
+            a.reaches_solution, a.reaches_problem_fix, {frozenset(a.members[c]) for c in a.cyclic})
+
+
+def random_graph(rng, n, m, offset=0):
+    nodes = [(offset + i, rng.choice(TYPES), rng.randrange(2)) for i in range(n)]
+    edges = [(offset + rng.randrange(n), offset + rng.randrange(n)) for _ in range(m)]
+    return nodes, edges
+
+
+def test_add_nodes_matches_a_full_load():
+    rng = random.Random(3)
+    for _ in range(50):
+        old_nodes, old_edges = random_graph(rng, 30, 40)
+        new_nodes, new_edges = random_graph(rng, 20, 30, offset=100)
+        bridges = [(rng.randrange(30), 100 + rng.randrange(20)) for _ in range(3)]
+        inc = ArgumentAnalyzer()
+        inc.load(old_nodes, old_edges)
+        inc.add_nodes(new_nodes, new_edges + bridges)
+        full = ArgumentAnalyzer()
+        full.load(old_nodes + new_nodes, old_edges + new_edges + bridges)
+        assert state(inc) == state(full)
+
+
+def reach_sets(nodes, edges):
+    """key -> set of keys reachable through at least one arrow."""
+    succ = {k: set() for k in nodes}
+    for u, v in edges: succ[u].add(v)
+    out = {}
+    for start in nodes:
+        seen, stack = set(), list(succ[start])
+        while stack:
+            n = stack.pop()
+            if n not in seen:
+                seen.add(n); stack.extend(succ[n])
+        out[start] = seen
+    return out
+
+
+def brute_findings(types, refs, edges):
+    """findings() recomputed from scratch by plain reachability, as comparable sets."""
+    reach = reach_sets(types, edges)
+    out = set()
+    for k in types:
+        group = frozenset(m for m in reach[k] if k in reach[m]) | {k}
+        if len(group) > 1: out.add(("cycle", group))
+        elif k in reach[k]: out.add(("cycle", frozenset([k])))
+        if not any(k in e for e in edges): out.add(("orphan", frozenset([k])))
+        if types[k] == "Solution" and not refs[k]: out.add(("unreferenced", frozenset([k])))
+        if types[k] == "Question" and not any(
+                types[p] == "Problem" and any(types[s] == "Solution" for s in reach[p]) for p in reach[k]):
+            out.add(("unresolved", frozenset([k])))
+    return out
+
+
+def as_set(findings):
+    return {(kind, frozenset(keys)) for kind, keys in findings}
+
+
+def test_incremental_edits_match_brute_force_and_changed_rows():
+    rng = random.Random(4)
+    a = ArgumentAnalyzer()
+    types, refs, edges = {}, {}, []
+    view = None # row -> finding, kept up to date from take_changes() like the findings window
+    for step in range(3000):
+        op = rng.random()
+        if op < 0.25 or len(types) < 3:
+            key = step
+            types[key] = rng.choice(TYPES); refs[key] = rng.randrange(2)
+            a.add_node(key, types[key], refs[key])
+        elif op < 0.55:
+            u, v = rng.choice(list(types)), rng.choice(list(types))
+            edges.append((u, v)); a.add_edge(u, v)
+        elif op < 0.7 and edges:
+            u, v = edges.pop(rng.randrange(len(edges))); a.remove_edge(u, v)
+        elif op < 0.8:
+            key = rng.choice(list(types))
+            types[key] = rng.choice(TYPES); a.set_type(key, types[key])
+        elif op < 0.85:
+            key = rng.choice(list(types))
+            refs[key] = rng.randrange(2); a.set_ref_count(key, refs[key])
+        elif op < 0.9:
+            a.text_changed(rng.choice(list(types)))
+        else:
+            key = rng.choice(list(types))
+            del types[key], refs[key]
+            edges = [e for e in edges if key not in e]
+            a.remove_node(key)
+
+        changes = a.take_changes()
+        if changes is None:
+            view = {row: a.finding(row) for row in a.rows()}
+        else:
+            for row in changes:
+                finding = a.finding(row)
+                if finding is None: view.pop(row, None)
+                else: view[row] = finding
+        assert view == {row: a.finding(row) for row in a.rows()}
+        if step % 10 == 0:
+            assert as_set(a.findings()) == brute_findings(types, refs, edges)
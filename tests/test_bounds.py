@@ -0,0 +1,49 @@
+# tests/test_bounds.py
+import random
+
+import pytest
+
+from objects.bounds import ContentBounds
+
+
+def brute_bbox(boxes):
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes), max(b[2] for b in boxes), max(b[3] for b in boxes))
+
+
+def random_box(rng):
+    x, y = rng.uniform(-5000, 5000), rng.uniform(-5000, 5000)
+    return (x, y, x + rng.uniform(10, 200), y + rng.uniform(10, 200))
+
+
+def test_bbox_follows_sets_discards_and_zoom():
+    rng = random.Random(1)
+    b = ContentBounds()
+    boxes = {}
+    for step in range(5000):
+        key = rng.randrange(300)
+        if rng.random() < 0.2:
+            b.discard(key); boxes.pop(key, None)
+        else:
+            boxes[key] = random_box(rng); b.set(key, boxes[key])
+        if step % 50 == 0:
+            assert (b.bbox() is None) == (not boxes)
+            if boxes:
+                assert b.bbox() == pytest.approx(brute_bbox(boxes.values()))
+    b.scaled(100, 50, 2.0)
+    expected = [(100 + (x1 - 100) * 2, 50 + (y1 - 50) * 2, 100 + (x2 - 100) * 2, 50 + (y2 - 50) * 2)
+                for x1, y1, x2, y2 in boxes.values()]
+    assert b.bbox() == pytest.approx(brute_bbox(expected))
+
+
+def test_heaps_stay_bounded_under_many_moves():
+    rng = random.Random(2)
+    b = ContentBounds()
+    n = 1000
+    for key in range(n): b.set(key, random_box(rng))
+    # The top-left box creeps right: bbox() keeps popping its stale entries off the min
+    # heaps, while the max heaps only collect them
+    for step in range(200000):
+        x = -10000 + step * 0.01
+        b.set(0, (x, x, x + 10, x + 10))
+        b.bbox()
+    assert max(len(h) for h in (b._x1, b._y1, b._x2, b._y2)) <= 2 * n + 64
@@ -0,0 +1,34 @@
+# tests/test_graph.py
+import random
+
+from objects.graph import ReachabilityIndex
+
+
+def brute_descendants(edges, start):
+    seen, stack = set(), [v for u, v in edges if u == start]
+    while stack:
+        n = stack.pop()
+        if n not in seen:
+            seen.add(n); stack.extend(v for u, v in edges if u == n)
+    return seen
+
+
+def test_cached_descendants_follow_edits():
+    rng = random.Random(5)
+    index = ReachabilityIndex()
+    edges = []
+    keys = list(range(40))
+    for step in range(2000):
+        op = rng.random()
+        if op < 0.5:
+            e = (rng.choice(keys), rng.choice(keys)); edges.append(e); index.add_edge(*e)
+        elif op < 0.8 and edges:
+            e = edges.pop(rng.randrange(len(edges))); index.remove_edge(*e)
+        elif op < 0.85:
+            batch = [(rng.choice(keys), rng.choice(keys)) for _ in range(5)]
+            edges.extend(batch); index.add_edges(batch)
+        elif op < 0.9:
+            key = rng.choice(keys)
+            edges = [e for e in edges if key not in e]; index.remove_node(key)
+        for key in rng.sample(keys, 5):
+            assert index.descendants(key) == brute_descendants(edges, key)
@@ -0,0 +1,42 @@
+# tests/test_image_export.py
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+
+from tools.image_export import Scene, export_svg, _TileRenderer
+
+
+class OldDraw:
+    """ImageDraw of a Pillow release without textbbox / anchor support."""
+    def __init__(self): self.calls = []
+    def textsize(self, text, font=None): return (len(text) * 6, 10)
+    def text(self, xy, text, fill=None, font=None, **kw):
+        assert not kw, "anchor is not supported here"
+        self.calls.append(xy)
+
+
+class NewDraw(OldDraw):
+    def textbbox(self, xy, text, font=None): return (1, 3, 1 + len(text) * 6, 13)
+
+
+def test_text_is_centered_without_anchor():
+    old, new = OldDraw(), NewDraw()
+    _TileRenderer._draw_centered(old, 100, 50, "abcd", "black", None)
+    _TileRenderer._draw_centered(new, 100, 50, "abcd", "black", None)
+    assert old.calls == [(88, 45)]
+    assert new.calls == [(100 - (1 + 25) / 2, 50 - 8)]
+
+
+def test_svg_dpi_only_scales_the_size(tmp_path):
+    scene = Scene([(0, 0, 100, 50, "Claim", "  indented")], [], (-10, -10, 110, 60))
+    export_svg(scene, tmp_path / "a.svg", dpi=192)
+    root = ET.parse(tmp_path / "a.svg").getroot()
+    assert (root.get("width"), root.get("height")) == ("240", "140")
+    assert root.get("viewBox") == "-10 -10 120 70"
+    assert "  indented" in (tmp_path / "a.svg").read_text(encoding="utf-8")
+
+
+def test_exporter_imports_without_tkinter():
+    code = "import sys; sys.modules['tkinter'] = None; import tools.image_export"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
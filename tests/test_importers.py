@@ -0,0 +1,76 @@
+# tests/test_importers.py
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from tools.importers import build_project, main, parse_dot, parse_markdown, parse_opml
+
+
+def named_edges(items, edges):
+    names = {key: text.split("\n", 1)[0] for key, text, _ in items}
+    return sorted((names[u], names[v]) for u, v in edges)
+
+
+def test_markdown_headings_form_the_tree():
+    items, edges = parse_markdown("# A\nbody of a\n## B\n### C\n## D\n# E?\n")
+    assert [text for _, text, _ in items] == ["A\nbody of a", "B", "C", "D", "E?"]
+    assert items[-1][2] == "Question"
+    assert named_edges(items, edges) == [("A", "B"), ("A", "D"), ("B", "C")]
+
+
+def test_markdown_text_before_the_first_heading_becomes_the_root():
+    items, edges = parse_markdown("Intro\nmore intro\n# A\n## B\n# C\n")
+    assert items[0][1] == "Intro\nmore intro"
+    assert named_edges(items, edges) == [("A", "B"), ("Intro", "A"), ("Intro", "C")]
+    project = build_project(items, edges)
+    assert len(project['nodes']) == 4 and len(project['links']) == 3
+
+
+def test_markdown_ignores_headings_in_code_fences():
+    items, _ = parse_markdown("# A\n```\n# not a heading\n```\n")
+    assert len(items) == 1
+
+
+def test_opml_outlines_and_notes():
+    items, edges = parse_opml('<opml><body><outline text="A" _note="n"><outline text="B" type="solution"/>'
+                              '</outline><outline text="C"/></body></opml>')
+    assert [(text, t) for _, text, t in items] == [("A\nn", "Explanation"), ("B", "Solution"), ("C", "Explanation")]
+    assert named_edges(items, edges) == [("A", "B")]
+
+
+def test_malformed_opml_is_a_parse_error():
+    with pytest.raises(ET.ParseError):
+        parse_opml('<opml><body><outline text="a">')
+
+
+def test_cli_reports_malformed_input_without_a_traceback(tmp_path, capsys):
+    src = tmp_path / "bad.opml"
+    src.write_text('<opml><body><outline text="a">')
+    with pytest.raises(SystemExit) as exit_info:
+        main([str(src), str(tmp_path / "out.xml")])
+    assert exit_info.value.code == 2
+    assert "error:" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "missing.md"), str(tmp_path / "out.xml")])
+
+
+def test_dot_chains_attributes_and_graph_names():
+    items, edges = parse_dot('strict digraph G { rankdir=LR; node [shape=box]; '
+                             'a [label="Why?"]; a -> b -> c [color=red]; b:port -> d }')
+    assert [(text, t) for _, text, t in items] == [("Why?", "Question"), ("b", "Explanation"),
+                                                    ("c", "Explanation"), ("d", "Explanation")]
+    assert named_edges(items, edges) == [("Why?", "b"), ("b", "c"), ("b", "d")]
+
+
+def test_dot_brace_groups_expand_to_one_edge_per_member():
+    items, edges = parse_dot("digraph{a -> {b c}}")
+    assert named_edges(items, edges) == [("a", "b"), ("a", "c")]
+    items, edges = parse_dot("digraph { {x y} -> subgraph s { z; w } }")
+    assert named_edges(items, edges) == [("x", "w"), ("x", "z"), ("y", "w"), ("y", "z")]
+
+
+def test_build_project_layout_centers_parents():
+    project = build_project([(0, "root", "Question"), (1, "a", "Problem"), (2, "b", "Solution")], [(0, 1), (0, 2)])
+    root, a, b = project['nodes']
+    assert a['x'] == b['x'] > root['x']
+    assert root['y'] == (a['y'] + b['y']) / 2
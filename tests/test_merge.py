@@ -0,0 +1,105 @@
+# tests/test_merge.py
+import copy
+
+from tools.merge import diff_projects, merge_projects
+
+
+def node(nid, text, refs=()):
+    return {'id': nid, 'type': "Explanation", 'x': 0, 'y': 0, 'w': 150, 'h': 60, 'text': text,
+            'collapsed': False, 'references': [dict(r) for r in refs]}
+
+
+def ref(rid, title):
+    return {'id': rid, 'title': title, 'link': "", 'file': "", 'desc': ""}
+
+
+def fixture():
+    """Base project: A (with references r1, r2) -> B."""
+    base = {'project_id': "p", 'nodes': [node("A", "claim", [ref("r1", "Smith 2020"), ref("r2", "Lee 2021")]),
+                                         node("B", "support")],
+            'links': [("A", "B")]}
+    return base, copy.deepcopy(base), copy.deepcopy(base)
+
+
+def by_id(project):
+    return {n['id']: n for n in project['nodes']}
+
+
+def test_delete_vs_edit_keeps_unchanged_references():
+    base, ours, theirs = fixture()
+    by_id(ours)["A"]['text'] = "edited in ours"
+    theirs['nodes'] = [n for n in theirs['nodes'] if n['id'] != "A"]
+    theirs['links'] = []
+
+    merged, conflicts = merge_projects(base, ours, theirs)
+    a = by_id(merged)["A"]
+    assert a['text'] == "edited in ours"
+    assert [r['id'] for r in a['references']] == ["r1", "r2"]
+    assert merged['links'] == [("A", "B")]
+    assert [c.kind for c in conflicts] == ["delete-edit"]
+
+
+def test_edit_vs_delete_keeps_unchanged_references():
+    base, ours, theirs = fixture()
+    ours['nodes'] = [n for n in ours['nodes'] if n['id'] != "A"]
+    ours['links'] = []
+    by_id(theirs)["A"]['text'] = "edited in theirs"
+    by_id(theirs)["A"]['references'][1]['title'] = "Lee 2022"
+
+    merged, conflicts = merge_projects(base, ours, theirs)
+    refs = {r['id']: r['title'] for r in by_id(merged)["A"]['references']}
+    assert refs == {"r1": "Smith 2020", "r2": "Lee 2022"}
+
+
+def test_plain_delete_drops_node_and_references():
+    base, ours, theirs = fixture()
+    theirs['nodes'] = [n for n in theirs['nodes'] if n['id'] != "A"]
+    theirs['links'] = []
+
+    merged, conflicts = merge_projects(base, ours, theirs)
+    assert list(by_id(merged)) == ["B"]
+    assert merged['links'] == [] and conflicts == []
+
+
+def test_reference_deleted_on_one_side_stays_deleted():
+    base, ours, theirs = fixture()
+    by_id(theirs)["A"]['references'].pop(0)
+    by_id(ours)["B"]['text'] = "edited"
+
+    merged, conflicts = merge_projects(base, ours, theirs)
+    assert [r['id'] for r in by_id(merged)["A"]['references']] == ["r2"]
+    assert conflicts == []
+
+
+def test_reference_edit_keeps_node_deleted_on_the_other_side():
+    base, ours, theirs = fixture()
+    by_id(ours)["A"]['references'][0]['title'] = "Smith 2021"
+    theirs['nodes'] = [n for n in theirs['nodes'] if n['id'] != "A"]
+    theirs['links'] = []
+
+    merged, conflicts = merge_projects(base, ours, theirs)
+    refs = {r['id']: r['title'] for r in by_id(merged)["A"]['references']}
+    assert refs == {"r1": "Smith 2021", "r2": "Lee 2021"}
+    assert merged['links'] == [("A", "B")]
+    assert any(c.record_id == "A" and "r1" in c.detail for c in conflicts)
+
+
+def test_reference_added_to_node_deleted_on_the_other_side():
+    base, ours, theirs = fixture()
+    ours['nodes'] = [n for n in ours['nodes'] if n['id'] != "A"]
+    ours['links'] = []
+    by_id(theirs)["A"]['references'].append(ref("r3", "New 2023"))
+
+    merged, conflicts = merge_projects(base, ours, theirs)
+    assert [r['id'] for r in by_id(merged)["A"]['references']] == ["r1", "r2", "r3"]
+    assert [c.kind for c in conflicts] == ["delete-edit"]
+
+
+def test_zoom_rounding_noise_is_not_a_move():
+    base, ours, theirs = fixture()
+    for n in ours['nodes']: n['x'] = n['x'] * 1.1 / 1.1 + 1e-9
+    by_id(theirs)["A"]['x'] = 40
+
+    assert diff_projects(base, ours).is_empty()
+    merged, conflicts = merge_projects(base, ours, theirs)
+    assert by_id(merged)["A"]['x'] == 40 and conflicts == []
@@ -0,0 +1,85 @@
+# tests/test_text_layout.py
+import random
+
+from objects.text_layout import ELLIPSIS, wrap_lines, layout_text
+
+
+def narrow_wide(s):
+    """Uneven glyph widths, so prefix fitting is not just a length check."""
+    return sum(3 if c in "mwMW" else 1 for c in s)
+
+
+def brute_wrap(text, width, measure):
+    """Every line of the full wrap: one word at a time, long words cut one character at a time."""
+    lines = []
+    for raw in text.split("\n"):
+        raw = raw.rstrip(" ")
+        indent = raw[:len(raw) - len(raw.lstrip(" "))]
+        current, first = None, True
+        for word in raw[len(indent):].split(" "):
+            if current is None:
+                if not word and not first: continue
+                current, first = (indent + word if first else word), False
+            elif measure(f"{current} {word}") <= width:
+                current = f"{current} {word}"
+            elif current.strip():
+                lines.append(current.rstrip(" "))
+                current = word or None
+            else:
+                current = f"{current} {word}"
+            while current and measure(current) > width and len(current) > 1:
+                cut = len(current) - 1
+                while cut > 1 and measure(current[:cut]) > width: cut -= 1
+                lines.append(current[:cut].rstrip(" "))
+                current = current[cut:]
+        lines.append(current)
+    return lines
+
+
+def random_text(rng):
+    parts = []
+    for _ in range(rng.randrange(0, 12)):
+        r = rng.random()
+        if r < 0.15: parts.append("\n")
+        elif r < 0.3: parts.append(" " * rng.randrange(1, 4))
+        else: parts.append("".join(rng.choice("aimw") for _ in range(rng.randrange(1, 14))) + " ")
+    return "".join(parts)
+
+
+def test_wrap_matches_full_wrap_cut_to_budget():
+    rng = random.Random(11)
+    for _ in range(3000):
+        text = random_text(rng)
+        width = rng.randrange(4, 20)
+        max_lines = rng.randrange(1, 6)
+        measure = rng.choice((len, narrow_wide))
+        full = brute_wrap(text, width, measure)
+        lines, truncated = wrap_lines(text, width, max_lines, measure)
+        assert lines == full[:max_lines], (text, width, max_lines)
+        # An empty line left by a final newline is not hidden content
+        hidden = full[max_lines:]
+        assert truncated == bool(hidden and not (hidden == [""] and text.endswith("\n"))), (text, width, max_lines)
+
+
+def test_lines_fit_the_width():
+    rng = random.Random(3)
+    for _ in range(1000):
+        width = rng.randrange(4, 20)
+        for line in layout_text(random_text(rng), width, 4, narrow_wide).split("\n"):
+            assert narrow_wide(line) <= width or len(line.rstrip(ELLIPSIS)) <= 1
+
+
+def test_leading_whitespace_is_kept():
+    assert wrap_lines("  lead", 50, 3, len) == (["  lead"], False)
+    assert wrap_lines("a\n    b c", 50, 3, len) == (["a", "    b c"], False)
+
+
+def test_trailing_whitespace_and_wrap_spaces_are_dropped():
+    assert wrap_lines("word   ", 50, 3, len) == (["word"], False)
+    assert wrap_lines("aaa  bbb", 3, 3, len) == (["aaa", "bbb"], False)
+
+
+def test_overflow_gets_an_ellipsis():
+    text = layout_text("one two three four five", 9, 2, len)
+    assert text.split("\n") == ["one two", "three" + ELLIPSIS]
+    assert layout_text("short", 9, 2, len) == "short"
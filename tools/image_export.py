@@ -0,0 +1,356 @@
+# tools/image_export.py
+"""
+Off-screen export of a logic map to SVG or PNG.
+
+Renders straight from the model (node, arrow and reference records), never from
+the Tk canvas, so it works for maps far larger than the window and runs headless:
+
+    python -m tools.image_export project.xml poster.svg
+    python -m tools.image_export project.xml poster.png --dpi 300
+    python -m tools.image_export project.xml part.png --ids <id>,<id> --tile-size 4096
+    python -m tools.image_export project.xml view.svg --region 0,0,2000,1500
+
+SVG is written as a stream. PNG is rendered band by band (or tile by tile) so
+memory stays bounded by `max_tile_bytes`, not by the size of the map.
+PNG output needs Pillow for text rendering; SVG has no dependencies.
+"""
+import argparse
+import math
+import os
+import struct
+import sys
+import zlib
+from xml.sax.saxutils import escape
+
+from constants import COLORS, BASE_FONT_SIZE
+from objects.connection import route_arrow
+from objects.project_file import read_project
+from objects.text_layout import layout_text
+
+SCREEN_DPI = 96         # One model unit is one pixel at 100% zoom
+MARGIN = 40             # Model units around the exported content
+MAX_TILE_BYTES = 32 * 1024 * 1024
+
+
+class Scene:
+    """Flattened geometry to draw: node boxes and arrow segments in model units."""
+    def __init__(self, nodes, arrows, bounds):
+        self.nodes = nodes      # [(x1, y1, x2, y2, node_type, text)]
+        self.arrows = arrows    # [(x1, y1, x2, y2)]
+        self.bounds = bounds    # (x1, y1, x2, y2)
+
+    @property
+    def width(self): return self.bounds[2] - self.bounds[0]
+
+    @property
+    def height(self): return self.bounds[3] - self.bounds[1]
+
+
+def build_scene(project, scope="full", ids=None, region=None):
+    """
+    Selects what to export from a project record (see objects.project_file):
+      full      - every node and arrow
+      selection - nodes whose id is in `ids`, and arrows between them
+      viewport  - nodes intersecting `region` (x1, y1, x2, y2); output is cropped to it
+    """
+    boxes = {}
+    nodes = []
+    for n in project['nodes']:
+        box = (n['x'], n['y'], n['x'] + n['w'], n['y'] + n['h'])
+        if scope == "selection" and n['id'] not in ids: continue
+        if scope == "viewport" and not _intersects(box, region): continue
+        boxes[n['id']] = box
+        nodes.append(box + (n['type'], n['text']))
+
+    arrows = []
+    for pid, cid in project['links']:
+        if pid in boxes and cid in boxes:
+            arrows.append(route_arrow(boxes[pid], boxes[cid]))
+
+    if scope == "viewport":
+        bounds = tuple(region)
+    elif nodes:
+        bounds = (min(b[0] for b in nodes) - MARGIN, min(b[1] for b in nodes) - MARGIN,
+                  max(b[2] for b in nodes) + MARGIN, max(b[3] for b in nodes) + MARGIN)
+    else:
+        bounds = (0, 0, 2 * MARGIN, 2 * MARGIN)
+    return Scene(nodes, arrows, bounds)
+
+
+def _intersects(a, b):
+    return a[0] <= b[2] and a[2] >= b[0] and a[1] <= b[3] and a[3] >= b[1]
+
+
+def _approx_measure(font_size):
+    """Average-glyph width estimate, used where no real font metrics are available."""
+    return lambda s: len(s) * font_size * 0.55
+
+
+def _node_text_lines(x1, y1, x2, y2, text, font_size, measure):
+    """Same excerpt rules as the canvas: wrap inside the box padding, ellipsize what is clipped."""
+    wrap = max(10, (x2 - x1) - 10)
+    max_lines = int(((y2 - y1) - 16) // (font_size * 1.3))
+    return layout_text(text, wrap, max_lines, measure).split("\n")
+
+
+# ---------------------------------------------------------------- SVG
+def export_svg(scene, path, dpi=SCREEN_DPI, progress=None):
+    """
+    Streams the scene to an SVG file; nothing but the current element is held in memory.
+    SVG is vector output, so `dpi` only sets the width/height attributes (the default
+    display size); the viewBox and all geometry stay in model units.
+    """
+    scale = dpi / SCREEN_DPI
+    bx, by = scene.bounds[0], scene.bounds[1]
+    font = BASE_FONT_SIZE * 96 / 72  # Tk point sizes -> model units
+    measure = _approx_measure(font)
+    total = max(1, len(scene.nodes) + len(scene.arrows))
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{scene.width * scale:.0f}" '
+                f'height="{scene.height * scale:.0f}" viewBox="{bx} {by} {scene.width} {scene.height}">\n')
+        f.write('<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="8" '
+                'markerHeight="8" orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z" '
+                f'fill="{COLORS["LineDefault"]}"/></marker></defs>\n')
+        f.write(f'<rect x="{bx}" y="{by}" width="{scene.width}" height="{scene.height}" fill="white"/>\n')
+
+        f.write(f'<g stroke="{COLORS["LineDefault"]}" stroke-width="2" marker-end="url(#arrow)">\n')
+        for i, (x1, y1, x2, y2) in enumerate(scene.arrows):
+            f.write(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}"/>\n')
+            if progress and i % 1000 == 0: progress(i / total)
+        f.write('</g>\n')
+
+        f.write(f'<g font-family="Arial" font-size="{font:.1f}" text-anchor="middle">\n')
+        for i, (x1, y1, x2, y2, node_type, text) in enumerate(scene.nodes):
+            cx = (x1 + x2) / 2
+            f.write(f'<rect x="{x1:.1f}" y="{y1:.1f}" width="{x2 - x1:.1f}" height="{y2 - y1:.1f}" '
+                    f'fill="{COLORS.get(node_type, "white")}" stroke="black"/>\n')
+            f.write(f'<text x="{cx:.1f}" y="{y1 + 10 + font * 0.35:.1f}" font-size="{font * 0.8:.1f}" '
+                    f'font-weight="bold" fill="#555">{escape(f"[{node_type}]")}</text>\n')
+            lines = _node_text_lines(x1, y1, x2, y2, text, font, measure)
+            line_h = font * 1.2
+            top = (y1 + y2) / 2 - line_h * (len(lines) - 1) / 2 + font * 0.35
+            f.write(f'<text x="{cx:.1f}" y="{top:.1f}" xml:space="preserve">') # Keep indentation
+            for j, line in enumerate(lines):
+                f.write(f'<tspan x="{cx:.1f}" dy="{0 if j == 0 else line_h:.1f}">{escape(line)}</tspan>')
+            f.write('</text>\n')
+            if progress and i % 1000 == 0: progress((len(scene.arrows) + i) / total)
+        f.write('</g>\n</svg>\n')
+    if progress: progress(1.0)
+
+
+# ---------------------------------------------------------------- PNG
+def export_png(scene, path, dpi=SCREEN_DPI, tile_size=None, max_tile_bytes=MAX_TILE_BYTES, progress=None):
+    """
+    Rasterizes the scene without ever holding the full image.
+    With `tile_size=None` a single PNG is streamed band by band (full width, few rows).
+    With a `tile_size` in pixels, a grid of PNG tiles is written next to `path`
+    (`name_r{row}_c{col}.png`), which keeps memory bounded even for very wide maps.
+    """
+    renderer = _TileRenderer(scene, dpi)
+    if tile_size:
+        tile_w = tile_h = int(tile_size)
+    else:
+        tile_w = renderer.width
+        tile_h = max(1, min(renderer.height, max_tile_bytes // (tile_w * 3)))
+    rows = math.ceil(renderer.height / tile_h)
+    cols = math.ceil(renderer.width / tile_w)
+    buckets = renderer.bucket(tile_w, tile_h)
+
+    if tile_size:
+        stem, ext = os.path.splitext(path)
+        for r in range(rows):
+            for c in range(cols):
+                w = min(tile_w, renderer.width - c * tile_w)
+                h = min(tile_h, renderer.height - r * tile_h)
+                with open(f"{stem}_r{r}_c{c}{ext or '.png'}", "wb") as f:
+                    writer = _PngStreamWriter(f, w, h, dpi)
+                    writer.write_rows(renderer.render(c * tile_w, r * tile_h, w, h, buckets.get((r, c), ())), w)
+                    writer.close()
+                if progress: progress((r * cols + c + 1) / (rows * cols))
+    else:
+        with open(path, "wb") as f:
+            writer = _PngStreamWriter(f, renderer.width, renderer.height, dpi)
+            for r in range(rows):
+                h = min(tile_h, renderer.height - r * tile_h)
+                writer.write_rows(renderer.render(0, r * tile_h, renderer.width, h, buckets.get((r, 0), ())),
+                                  renderer.width)
+                if progress: progress((r + 1) / rows)
+            writer.close()
+
+
+class _TileRenderer:
+    """Draws the parts of a scene that touch one pixel tile, using Pillow."""
+    def __init__(self, scene, dpi):
+        try:
+            from PIL import Image, ImageDraw, ImageFont
+        except ImportError:
+            raise RuntimeError("PNG export needs Pillow (pip install pillow). SVG export works without it.")
+        self.Image, self.ImageDraw = Image, ImageDraw
+        self.scene = scene
+        self.scale = dpi / SCREEN_DPI
+        self.width = max(1, int(math.ceil(scene.width * self.scale)))
+        self.height = max(1, int(math.ceil(scene.height * self.scale)))
+        size = max(1, round(BASE_FONT_SIZE * 96 / 72 * self.scale))
+        self.font = self._load_font(ImageFont, size)
+        self.label_font = self._load_font(ImageFont, max(1, int(size * 0.8)))
+        self.font_px = size
+        # FreeTypeFont.getlength is Pillow 8+; older releases and the bitmap default font only have getsize
+        self.measure = getattr(self.font, "getlength", None) or (lambda s: self.font.getsize(s)[0])
+
+    @staticmethod
+    def _load_font(ImageFont, size):
+        for name in ("arial.ttf", "Arial.ttf", "DejaVuSans.ttf"):
+            try: return ImageFont.truetype(name, size)
+            except OSError: pass
+        try: return ImageFont.load_default(size)
+        except TypeError: return ImageFont.load_default()
+
+    def _to_px(self, x, y):
+        return (x - self.scene.bounds[0]) * self.scale, (y - self.scene.bounds[1]) * self.scale
+
+    def bucket(self, tile_w, tile_h):
+        """Assigns every shape to the tiles its pixel bounding box overlaps (one pass)."""
+        buckets = {}
+        pad = 12 * self.scale # Arrowheads and outlines spill slightly past the geometry
+        def add(item, x1, y1, x2, y2):
+            (px1, py1), (px2, py2) = self._to_px(min(x1, x2), min(y1, y2)), self._to_px(max(x1, x2), max(y1, y2))
+            for r in range(max(0, int((py1 - pad) // tile_h)), int((py2 + pad) // tile_h) + 1):
+                for c in range(max(0, int((px1 - pad) // tile_w)), int((px2 + pad) // tile_w) + 1):
+                    buckets.setdefault((r, c), []).append(item)
+        for a in self.scene.arrows: add(("arrow", a), *a)
+        for n in self.scene.nodes: add(("node", n), *n[:4])
+        return buckets
+
+    def render(self, left, top, w, h, items):
+        img = self.Image.new("RGB", (w, h), "white")
+        draw = self.ImageDraw.Draw(img)
+        ox, oy = left, top
+        # Arrows first so node boxes sit on top, as on the canvas
+        for kind, shape in sorted(items, key=lambda it: it[0] != "arrow"):
+            if kind == "arrow":
+                self._draw_arrow(draw, shape, ox, oy)
+            else:
+                self._draw_node(draw, shape, ox, oy)
+        return img.tobytes()
+
+    def _draw_arrow(self, draw, arrow, ox, oy):
+        x1, y1 = self._to_px(arrow[0], arrow[1]); x2, y2 = self._to_px(arrow[2], arrow[3])
+        x1 -= ox; x2 -= ox; y1 -= oy; y2 -= oy
+        width = max(1, round(2 * self.scale))
+        draw.line((x1, y1, x2, y2), fill=COLORS["LineDefault"], width=width)
+        angle = math.atan2(y2 - y1, x2 - x1)
+        size = 8 * self.scale
+        left = (x2 - size * math.cos(angle - 0.4), y2 - size * math.sin(angle - 0.4))
+        right = (x2 - size * math.cos(angle + 0.4), y2 - size * math.sin(angle + 0.4))
+        draw.polygon([(x2, y2), left, right], fill=COLORS["LineDefault"])
+
+    def _draw_node(self, draw, node, ox, oy):
+        x1, y1, x2, y2, node_type, text = node
+        px1, py1 = self._to_px(x1, y1); px2, py2 = self._to_px(x2, y2)
+        px1 -= ox; px2 -= ox; py1 -= oy; py2 -= oy
+        draw.rectangle((px1, py1, px2, py2), fill=COLORS.get(node_type, "white"), outline="black",
+                       width=max(1, round(self.scale)))
+        cx = (px1 + px2) / 2
+        self._draw_centered(draw, cx, py1 + 10 * self.scale, f"[{node_type}]", "#555", self.label_font)
+        pad = 10 * self.scale
+        max_lines = int(((py2 - py1) - 16 * self.scale) // (self.font_px * 1.3))
+        lines = layout_text(text, max(10, (px2 - px1) - pad), max_lines, self.measure).split("\n")
+        line_h = self.font_px * 1.2
+        top = (py1 + py2) / 2 - line_h * (len(lines) - 1) / 2
+        for j, line in enumerate(lines):
+            self._draw_centered(draw, cx, top + j * line_h, line, "black", self.font)
+
+    @staticmethod
+    def _draw_centered(draw, cx, cy, text, fill, font):
+        """
+        Draws `text` centered on (cx, cy). Computed from the text box instead of anchor="mm",
+        which older Pillow releases and bitmap fonts reject.
+        """
+        if not text: return
+        if hasattr(draw, "textbbox"):
+            l, t, r, b = draw.textbbox((0, 0), text, font=font)
+        else:
+            (r, b), l, t = draw.textsize(text, font=font), 0, 0
+        draw.text((cx - (l + r) / 2, cy - (t + b) / 2), text, fill=fill, font=font)
+
+
+class _PngStreamWriter:
+    """Minimal streaming PNG encoder (8-bit RGB): rows are deflated and flushed as IDAT chunks."""
+    CHUNK = 1 << 20
+
+    def __init__(self, f, width, height, dpi):
+        self.f = f
+        self.zip = zlib.compressobj(6)
+        self.pending = []
+        self.pending_len = 0
+        f.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        ppm = int(round(dpi / 0.0254))
+        self._chunk(b"pHYs", struct.pack(">IIB", ppm, ppm, 1))
+
+    def _chunk(self, kind, data):
+        self.f.write(struct.pack(">I", len(data)))
+        self.f.write(kind); self.f.write(data)
+        self.f.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)) & 0xFFFFFFFF))
+
+    def _push(self, data):
+        if not data: return
+        self.pending.append(data); self.pending_len += len(data)
+        if self.pending_len >= self.CHUNK: self._flush()
+
+    def _flush(self):
+        if self.pending:
+            self._chunk(b"IDAT", b"".join(self.pending))
+            self.pending = []; self.pending_len = 0
+
+    def write_rows(self, raw, width):
+        stride = width * 3
+        for start in range(0, len(raw), stride):
+            self._push(self.zip.compress(b"\x00" + raw[start:start + stride])) # Filter type 0 (None)
+
+    def close(self):
+        self._push(self.zip.flush())
+        self._flush()
+        self._chunk(b"IEND", b"")
+
+
+def export_scene(scene, path, dpi=SCREEN_DPI, tile_size=None, progress=None):
+    """Dispatches on the file extension (.svg or .png)."""
+    if path.lower().endswith(".svg"):
+        export_svg(scene, path, dpi, progress)
+    elif path.lower().endswith(".png"):
+        export_png(scene, path, dpi, tile_size, progress=progress)
+    else:
+        raise ValueError(f"Unsupported export format: {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a ThesisFlow map to SVG or PNG without opening the UI.")
+    parser.add_argument("project", help="ThesisFlow XML project")
+    parser.add_argument("output", help="Output file (.svg or .png)")
+    parser.add_argument("--dpi", type=float, default=SCREEN_DPI, help="PNG: output resolution (96 = 100%% zoom). SVG: only scales the width/height attributes")
+    parser.add_argument("--ids", help="Comma-separated node ids to export (selection scope)")
+    parser.add_argument("--region", help="x1,y1,x2,y2 in model units to export (viewport scope)")
+    parser.add_argument("--tile-size", type=int, help="PNG only: write a grid of tiles of this many pixels")
+    args = parser.parse_args(argv)
+
+    project = read_project(args.project)
+    if args.ids:
+        scene = build_scene(project, "selection", ids=set(args.ids.split(",")))
+    elif args.region:
+        scene = build_scene(project, "viewport", region=tuple(float(v) for v in args.region.split(",")))
+    else:
+        scene = build_scene(project)
+    try:
+        export_scene(scene, args.output, args.dpi, args.tile_size)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Exported {len(scene.nodes)} nodes, {len(scene.arrows)} arrows to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
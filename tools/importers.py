@@ -0,0 +1,287 @@
+# tools/importers.py
+"""
+Turns outlines from other tools into ThesisFlow project records (see objects.project_file).
+
+    Markdown  - "#" headings form the tree; body lines under a heading become its text
+    OPML      - nested <outline text="..."> elements (e.g. from outliners and mind-mapping apps)
+    DOT       - Graphviz nodes and "->" / "--" edges; `label` and `type` attributes are used
+
+Nodes are placed automatically: depth goes to the column, leaves get one row each in
+outline order and every parent is centered on its children. Everything is linear in the
+size of the input, so a 10k-line outline imports in well under a second (drawing is
+handled by ThesisFlowApp.insert_records).
+
+    python -m tools.importers thesis.md thesis.xml
+"""
+import argparse
+import re
+import sys
+import uuid
+import xml.etree.ElementTree as ET
+
+from constants import BASE_NODE_WIDTH, BASE_NODE_HEIGHT
+
+COLUMN_STEP = BASE_NODE_WIDTH + 60
+ROW_STEP = BASE_NODE_HEIGHT + 20
+NODE_TYPES = ("Question", "Problem", "Solution", "Explanation", "Conclusion")
+DEFAULT_TYPE = "Explanation"
+
+IMPORT_FILETYPES = [("Outlines", "*.md *.markdown *.opml *.dot *.gv"), ("Markdown", "*.md *.markdown"),
+                    ("OPML", "*.opml"), ("Graphviz", "*.dot *.gv")]
+
+
+def guess_type(text, explicit=None):
+    """An explicit type if it is a known one, else Question for "...?" and the default otherwise."""
+    if explicit:
+        for t in NODE_TYPES:
+            if t.lower() == explicit.strip().lower(): return t
+    first = text.strip().split("\n", 1)[0]
+    return "Question" if first.endswith("?") else DEFAULT_TYPE
+
+
+def build_project(items, edges):
+    """
+    Lays out (key, text, type) items connected by (parent key, child key) edges and returns
+    a project record. Arbitrary graphs are placed along a depth-first spanning tree.
+    """
+    order = [key for key, _, _ in items]
+    children = {key: [] for key in order}
+    has_parent = set()
+    for parent, child in edges:
+        if parent in children and child in children:
+            children[parent].append(child)
+            has_parent.add(child)
+
+    # Depth-first walk from the roots (and from any node a cycle kept unvisited)
+    depth, tree_kids, preorder = {}, {}, []
+    for root in [k for k in order if k not in has_parent] + order:
+        if root in depth: continue
+        depth[root] = 0
+        stack = [root]
+        while stack:
+            key = stack.pop()
+            preorder.append(key)
+            kids = [c for c in children[key] if c not in depth]
+            for c in kids: depth[c] = depth[key] + 1
+            tree_kids[key] = kids
+            stack.extend(reversed(kids))
+
+    # Leaves take consecutive rows; parents sit at the middle of their children
+    row = {}
+    next_row = 0
+    for key in preorder:
+        if not tree_kids[key]:
+            row[key] = next_row; next_row += 1
+    for key in reversed(preorder):
+        kids = tree_kids[key]
+        if kids: row[key] = (row[kids[0]] + row[kids[-1]]) / 2
+
+    ids = {}
+    nodes = []
+    for key, text, node_type in items:
+        ids[key] = str(uuid.uuid4())
+        nodes.append({'id': ids[key], 'type': node_type, 'x': depth[key] * COLUMN_STEP, 'y': row[key] * ROW_STEP,
+                      'w': BASE_NODE_WIDTH, 'h': BASE_NODE_HEIGHT, 'text': text, 'collapsed': False,
+                      'references': []})
+    links = [(ids[p], ids[c]) for p, c in edges if p in ids and c in ids]
+    return {'project_id': str(uuid.uuid4()), 'nodes': nodes, 'links': links}
+
+
+# --- Markdown -----------------------------------------------------------------
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+def parse_markdown(text):
+    """Text before the first heading becomes a root node above the top-level headings."""
+    items, edges = [], []
+    stack = [] # (level, index) of the open headings
+    preamble = []
+    top_level = []
+    body = preamble
+    in_fence = False
+    for line in text.splitlines():
+        if _FENCE.match(line):
+            in_fence = not in_fence; continue
+        m = None if in_fence else _HEADING.match(line)
+        if m:
+            level = len(m.group(1))
+            while stack and stack[-1][0] >= level: stack.pop()
+            key = len(items)
+            items.append([key, m.group(2), None])
+            if stack: edges.append((stack[-1][1], key))
+            else: top_level.append(key)
+            stack.append((level, key))
+            body = []
+            items[key][2] = body
+        elif line.strip():
+            body.append(line.strip())
+    result = []
+    if preamble:
+        text = "\n".join(preamble)
+        result.append((-1, text, guess_type(text)))
+        edges[:0] = [(-1, key) for key in top_level]
+    for key, title, body_lines in items:
+        text = title if not body_lines else title + "\n" + "\n".join(body_lines)
+        result.append((key, text, guess_type(title)))
+    return result, edges
+
+
+# --- OPML ---------------------------------------------------------------------
+def parse_opml(text):
+    root = ET.fromstring(text)
+    body = root.find("body")
+    if body is None: body = root
+    items, edges = [], []
+    stack = [(None, outline) for outline in reversed(body.findall("outline"))]
+    while stack:
+        parent, el = stack.pop()
+        key = len(items)
+        title = el.get("text") or el.get("title") or ""
+        note = el.get("_note")
+        items.append((key, title + "\n" + note if note else title, guess_type(title, el.get("type"))))
+        if parent is not None: edges.append((parent, key))
+        stack.extend((key, child) for child in reversed(el.findall("outline")))
+    return items, edges
+
+
+# --- Graphviz DOT ---------------------------------------------------------------
+_DOT_TOKEN = re.compile(r'''
+    (?P<skip>\s+|//[^\n]*|\#[^\n]*|/\*.*?\*/)
+  | (?P<edge>->|--)
+  | (?P<quoted>"(?:[^"\\]|\\.)*")
+  | (?P<html><(?:[^<>]|<[^<>]*>)*>)
+  | (?P<id>[A-Za-z_\x80-\uffff][\w\x80-\uffff]*|-?(?:\.\d+|\d+(?:\.\d*)?))
+  | (?P<punct>[{}\[\];,=:])
+''', re.VERBOSE | re.DOTALL)
+_DOT_KEYWORDS = {"strict", "graph", "digraph", "subgraph", "node", "edge"}
+
+
+def _dot_tokens(text):
+    pos = 0
+    while pos < len(text):
+        m = _DOT_TOKEN.match(text, pos)
+        if not m: raise ValueError(f"DOT syntax error near: {text[pos:pos + 30]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "skip": continue
+        value = m.group()
+        if kind == "quoted": value = value[1:-1].replace('\\"', '"').replace("\\n", "\n")
+        elif kind == "html": value = value[1:-1]
+        yield ("id" if kind in ("quoted", "html") else kind), value
+
+
+def parse_dot(text):
+    """
+    Reads node ids, `label`/`type` attributes and edge chains; styling is ignored.
+    A `{...}` or subgraph operand in an edge stands for all of its nodes, so
+    `a -> {b c}` gives the arrows a -> b and a -> c.
+    """
+    tokens = list(_dot_tokens(text))
+    items, index, edges = [], {}, []
+
+    def node(name):
+        if name not in index:
+            index[name] = len(items)
+            items.append([index[name], name, {}])
+        return index[name]
+
+    def value_at(i):
+        return tokens[i][1] if i < len(tokens) else None
+
+    def attrs(i):
+        """Parses `[a=b, c=d]` lists starting at token i; returns (dict, next index)."""
+        found = {}
+        while value_at(i) == "[":
+            i += 1
+            while i < len(tokens) and tokens[i][1] != "]":
+                if tokens[i][0] == "id" and i + 2 < len(tokens) and tokens[i + 1][1] == "=":
+                    found[tokens[i][1]] = tokens[i + 2][1]; i += 3
+                else: i += 1
+            i += 1
+        return found, i
+
+    def group(i):
+        """Statements from just after `{` to the matching `}`; returns (node keys, next index)."""
+        members = {}
+        while i < len(tokens) and tokens[i][1] != "}":
+            i = statement(i, members)
+        return list(members), i + 1
+
+    def operand(i):
+        """A node id or a group at token i; returns (keys, is group, next index), keys None if neither."""
+        if value_at(i) == "subgraph":
+            i += 1
+            if i < len(tokens) and tokens[i][0] == "id": i += 1 # Its name
+        if value_at(i) == "{":
+            keys, i = group(i + 1)
+            return keys, True, i
+        if i < len(tokens) and tokens[i][0] == "id" and tokens[i][1] not in _DOT_KEYWORDS:
+            keys = [node(tokens[i][1])]
+            i += 1
+            if value_at(i) == ":": i += 2 # Port
+            return keys, False, i
+        return None, False, i
+
+    def statement(i, members):
+        kind, value = tokens[i]
+        if value in ("node", "edge", "graph") and value_at(i + 1) == "[":
+            return attrs(i + 1)[1] # Defaults carry no nodes of their own
+        if kind == "id" and value_at(i + 1) == "=":
+            return i + 3 # Graph attribute such as rankdir=LR
+        keys, is_group, j = operand(i)
+        if keys is None: return i + 1 # Separators and anything unsupported
+        chain = [keys]
+        while j < len(tokens) and tokens[j][0] == "edge":
+            keys, more, k = operand(j + 1)
+            if keys is None: break
+            chain.append(keys); is_group = is_group or more; j = k
+        found, j = attrs(j)
+        if len(chain) == 1 and not is_group: items[chain[0][0]][2].update(found)
+        for tails, heads in zip(chain, chain[1:]):
+            edges.extend((u, v) for u in tails for v in heads)
+        for keys in chain: members.update(dict.fromkeys(keys))
+        return j
+
+    # Graph headers ("strict digraph name") come before the body's brace
+    i = 0
+    while i < len(tokens):
+        if tokens[i][1] == "{": _, i = group(i + 1)
+        else: i += 1
+
+    result = []
+    for key, name, a in items:
+        label = a.get("label", name)
+        result.append((key, label, guess_type(label, a.get("type"))))
+    return result, edges
+
+
+PARSERS = {".md": parse_markdown, ".markdown": parse_markdown, ".opml": parse_opml,
+           ".dot": parse_dot, ".gv": parse_dot}
+
+
+def import_file(path):
+    """Project record for a Markdown, OPML or DOT file, chosen by extension."""
+    ext = path[path.rfind("."):].lower() if "." in path else ""
+    parser = PARSERS.get(ext)
+    if parser is None: raise ValueError(f"Unsupported outline format: {ext or path}")
+    with open(path, encoding="utf-8") as f:
+        items, edges = parser(f.read())
+    return build_project(items, edges)
+
+
+def main(argv=None):
+    from objects.project_file import write_project
+    parser = argparse.ArgumentParser(description="Convert a Markdown, OPML or DOT outline into a ThesisFlow project.")
+    parser.add_argument("source")
+    parser.add_argument("output", help="Project file to write (.xml)")
+    args = parser.parse_args(argv)
+    try:
+        project = import_file(args.source)
+    except (ValueError, ET.ParseError, OSError) as e: parser.error(str(e))
+    write_project(args.output, project)
+    print(f"Imported {len(project['nodes'])} nodes, {len(project['links'])} links -> {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
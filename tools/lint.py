@@ -0,0 +1,67 @@
+# tools/lint.py
+"""
+Batch lint of ThesisFlow projects, without the UI:
+
+    python -m tools.lint chapter1.xml chapter2.xml ...
+    python -m tools.lint drafts/*.xml --jobs 4 --only cycle,unresolved
+
+Exit code is 1 when any finding is reported, so it can gate a CI job.
+"""
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from objects.analysis import ArgumentAnalyzer, FINDING_LABELS
+from objects.project_file import read_project
+
+
+def lint_project(path, only=None):
+    """Returns (path, [(kind, message)]) for one project file."""
+    try:
+        project = read_project(path)
+    except Exception as e:
+        return path, [("error", f"Cannot read project: {e}")]
+    texts = {n['id']: n['text'] for n in project['nodes']}
+    analyzer = ArgumentAnalyzer()
+    analyzer.load(((n['id'], n['type'], len(n['references'])) for n in project['nodes']), project['links'])
+
+    out = []
+    for kind, keys in analyzer.findings():
+        if only and kind not in only: continue
+        names = ", ".join(_describe(k, texts[k]) for k in keys[:5])
+        if len(keys) > 5: names += f", ... ({len(keys)} nodes)"
+        out.append((kind, f"{FINDING_LABELS[kind]}: {names}"))
+    return path, out
+
+
+def _describe(node_id, text):
+    first_line = text.strip().split("\n", 1)[0]
+    if len(first_line) > 40: first_line = first_line[:39] + "…"
+    return f'"{first_line}" [{node_id[:8]}]'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check ThesisFlow logic maps for structural problems.")
+    parser.add_argument("projects", nargs="+", help="ThesisFlow XML project files")
+    parser.add_argument("--only", help="Comma-separated kinds: " + ",".join(FINDING_LABELS))
+    parser.add_argument("--jobs", type=int, default=1, help="Lint files in parallel processes")
+    args = parser.parse_args(argv)
+    only = set(args.only.split(",")) if args.only else None
+
+    if args.jobs > 1 and len(args.projects) > 1:
+        with ProcessPoolExecutor(args.jobs) as pool:
+            results = list(pool.map(lint_project, args.projects, [only] * len(args.projects)))
+    else:
+        results = [lint_project(p, only) for p in args.projects]
+
+    total = 0
+    for path, findings in results:
+        for kind, message in findings:
+            print(f"{path}: {kind}: {message}")
+        total += len(findings)
+    print(f"{total} finding(s) in {len(results)} file(s)", file=sys.stderr)
+    return 1 if total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
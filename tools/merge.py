@@ -0,0 +1,259 @@
+# tools/merge.py
+"""
+Structural diff and three-way merge of ThesisFlow projects.
+
+Nodes, references and links are matched by id. Every record is reduced to one tuple of
+its content fields, so an unchanged record costs a single tuple comparison and only edited
+records are compared field by field.
+
+    python -m tools.merge diff old.xml new.xml
+    python -m tools.merge merge base.xml ours.xml theirs.xml -o merged.xml
+
+`merge` exits with status 1 when conflicts were found; the merged file keeps "ours"
+for every conflicting field and the conflicts are listed on stdout.
+"""
+import argparse
+import sys
+from operator import itemgetter
+
+from objects.project_file import read_project, write_project
+
+# Field groups that can change independently, and the conflict name of each
+NODE_FIELDS = (("type", ("type",)), ("text", ("text",)), ("move", ("x", "y")),
+               ("resize", ("w", "h")), ("collapse", ("collapsed",)))
+REF_FIELDS = ("title", "link", "file", "desc")
+# Positions and sizes are stored divided by the zoom level, so zooming in and out again
+# leaves rounding noise; differences below this (in model units) are not edits
+COORD_TOLERANCE = 0.01
+
+_node_key = itemgetter('type', 'x', 'y', 'w', 'h', 'text', 'collapsed')
+_ref_key = itemgetter(*REF_FIELDS)
+
+
+class ProjectIndex:
+    """Records of one project keyed by id, each with its content key."""
+    def __init__(self, project):
+        self.project = project
+        # Keys are compared, not hashed: equal hashes would not prove equal content
+        self.nodes = {}     # node id -> (key, record)
+        self.refs = {}      # ref id -> (key, (owner node id, record))
+        self.links = set(project['links'])
+        for n in project['nodes']:
+            nid = n['id']
+            self.nodes[nid] = (_node_key(n), n)
+            for r in n['references']:
+                self.refs[r['id']] = ((nid,) + _ref_key(r), (nid, r))
+
+
+def _same(a, b):
+    """Equal field values, allowing COORD_TOLERANCE between numbers."""
+    if a == b: return True
+    return (isinstance(a, (int, float)) and isinstance(b, (int, float))
+            and not isinstance(a, bool) and abs(a - b) <= COORD_TOLERANCE)
+
+
+def _node_changes(a, b):
+    """Names of the field groups that differ between two versions of a node."""
+    return [name for name, fields in NODE_FIELDS if not all(_same(a.get(f), b.get(f)) for f in fields)]
+
+
+class Diff:
+    def __init__(self):
+        self.added = []         # node ids only in the new version
+        self.removed = []       # node ids only in the old version
+        self.changed = {}       # node id -> [field group names]
+        self.refs_added = []
+        self.refs_removed = []
+        self.refs_changed = []
+        self.links_added = []
+        self.links_removed = []
+
+    def is_empty(self):
+        return not (self.added or self.removed or self.changed or self.refs_added or self.refs_removed
+                    or self.refs_changed or self.links_added or self.links_removed)
+
+    def summary(self):
+        return (f"nodes: +{len(self.added)} -{len(self.removed)} ~{len(self.changed)}, "
+                f"references: +{len(self.refs_added)} -{len(self.refs_removed)} ~{len(self.refs_changed)}, "
+                f"links: +{len(self.links_added)} -{len(self.links_removed)}")
+
+
+def diff_projects(old, new):
+    """Diff of two projects (records or ProjectIndex); linear in the number of records."""
+    a = old if isinstance(old, ProjectIndex) else ProjectIndex(old)
+    b = new if isinstance(new, ProjectIndex) else ProjectIndex(new)
+    d = Diff()
+    for nid, (key, rec) in b.nodes.items():
+        prev = a.nodes.get(nid)
+        if prev is None: d.added.append(nid)
+        elif prev[0] != key:
+            changes = _node_changes(prev[1], rec)
+            if changes: d.changed[nid] = changes
+    d.removed = [nid for nid in a.nodes if nid not in b.nodes]
+    for rid, (key, rec) in b.refs.items():
+        prev = a.refs.get(rid)
+        if prev is None: d.refs_added.append(rid)
+        elif prev[0] != key: d.refs_changed.append(rid)
+    d.refs_removed = [rid for rid in a.refs if rid not in b.refs]
+    d.links_added = [l for l in b.links if l not in a.links]
+    d.links_removed = [l for l in a.links if l not in b.links]
+    return d
+
+
+class Conflict:
+    def __init__(self, kind, record_id, detail):
+        self.kind = kind            # text / move / resize / type / collapse / delete-edit / add-add / reference
+        self.record_id = record_id
+        self.detail = detail
+
+    def __str__(self):
+        return f"{self.kind}: {self.record_id}: {self.detail}"
+
+
+def _merge_record(base, ours, theirs, groups, conflict_kind, record_id, conflicts):
+    """Field-group three-way merge of one record present on all sides; ours wins conflicts."""
+    merged = dict(ours)
+    for name, fields in groups:
+        o_same = all(_same(ours.get(f), base.get(f)) for f in fields)
+        t_same = all(_same(theirs.get(f), base.get(f)) for f in fields)
+        if o_same and not t_same:
+            for f in fields: merged[f] = theirs.get(f)
+        elif not t_same and not all(_same(ours.get(f), theirs.get(f)) for f in fields):
+            conflicts.append(Conflict(conflict_kind or name, record_id, f"{name} changed on both sides"))
+    return merged
+
+
+def _merge_keyed(base, ours, theirs, merge_fn, conflicts, label, dropped_with_parent=None):
+    """
+    Generic three-way merge of id -> (key, record) maps.
+    Returns id -> record for everything that survives, in ours-then-theirs order.
+    dropped_with_parent(id, side) tells whether "ours" or "theirs" only lost an unchanged
+    record by deleting its parent while the parent survived the merge; the record is kept.
+    """
+    out = {}
+    for rid, (okey, orec) in ours.items():
+        b = base.get(rid); t = theirs.get(rid)
+        if b is None:
+            if t is not None and t[0] != okey:
+                conflicts.append(Conflict("add-add", rid, f"{label} added on both sides with different content"))
+            out[rid] = orec
+        elif t is None:
+            # Deleted in theirs: fine if ours did not touch it
+            if okey == b[0]:
+                if dropped_with_parent and dropped_with_parent(rid, "theirs"): out[rid] = orec
+                continue
+            conflicts.append(Conflict("delete-edit", rid, f"{label} deleted in theirs but edited in ours (kept)"))
+            out[rid] = orec
+        elif okey == b[0]:
+            out[rid] = t[1]              # Unchanged in ours: take theirs as is
+        elif t[0] == b[0]:
+            out[rid] = orec              # Unchanged in theirs: take ours
+        else:
+            out[rid] = merge_fn(b[1], orec, t[1], rid)
+    for rid, (tkey, trec) in theirs.items():
+        if rid in ours: continue
+        b = base.get(rid)
+        if b is None:
+            out[rid] = trec
+        elif tkey != b[0]:
+            conflicts.append(Conflict("delete-edit", rid, f"{label} deleted in ours but edited in theirs (kept)"))
+            out[rid] = trec
+        elif dropped_with_parent and dropped_with_parent(rid, "ours"):
+            out[rid] = trec
+    return out
+
+
+def _merge_ref(base, ours, theirs, rid, conflicts):
+    groups = (("owner", ("owner",)),) + tuple((f, (f,)) for f in REF_FIELDS)
+    b, o, t = (dict(r, owner=owner) for owner, r in (base, ours, theirs))
+    merged = _merge_record(b, o, t, groups, "reference", rid, conflicts)
+    return merged.pop('owner'), merged
+
+
+def merge_projects(base, ours, theirs):
+    """Three-way merge of project records. Returns (merged project, [Conflict])."""
+    bi, oi, ti = ProjectIndex(base), ProjectIndex(ours), ProjectIndex(theirs)
+    conflicts = []
+
+    nodes = _merge_keyed(bi.nodes, oi.nodes, ti.nodes,
+                         lambda b, o, t, rid: _merge_record(b, o, t, NODE_FIELDS, None, rid, conflicts),
+                         conflicts, "node")
+
+    # A reference added or edited on one side keeps its node alive when the other side
+    # deleted that node, like a node edit does
+    for side, other in ((oi, "theirs"), (ti, "ours")):
+        for rid, (key, (owner_id, rec)) in side.refs.items():
+            if owner_id in nodes: continue
+            b = bi.refs.get(rid)
+            if b is not None and b[0] == key: continue
+            nodes[owner_id] = side.nodes[owner_id][1]
+            conflicts.append(Conflict("delete-edit", owner_id,
+                                      f"node deleted in {other} but its reference {rid} was edited (kept)"))
+
+    def dropped_with_owner(rid, side):
+        # Deleting a node drops its references implicitly; keep them if the node was kept
+        owner_id = bi.refs[rid][1][0]
+        return owner_id in nodes and owner_id not in (oi if side == "ours" else ti).nodes
+
+    refs = _merge_keyed(bi.refs, oi.refs, ti.refs,
+                        lambda b, o, t, rid: _merge_ref(b, o, t, rid, conflicts),
+                        conflicts, "reference", dropped_with_owner)
+
+    merged_nodes = []
+    for nid, rec in nodes.items():
+        merged_nodes.append(dict(rec, references=[]))
+    by_id = {n['id']: n for n in merged_nodes}
+    for owner_id, rec in refs.values():
+        owner = by_id.get(owner_id)
+        if owner is None: continue # Its node was deleted
+        owner['references'].append(rec)
+
+    def dropped_with_node(side, link):
+        # A side that deleted an endpoint drops its links implicitly, not as an edit of its own
+        return link[0] not in side.nodes or link[1] not in side.nodes
+
+    links = []
+    # Ours in file order, then links only theirs has
+    for link in ours['links'] + [l for l in theirs['links'] if l not in oi.links]:
+        if link[0] not in by_id or link[1] not in by_id: continue
+        if link not in bi.links or (link in oi.links and link in ti.links):
+            links.append(link)
+        elif link in oi.links and dropped_with_node(ti, link) or link in ti.links and dropped_with_node(oi, link):
+            links.append(link) # Endpoint was kept after a delete/edit conflict
+
+    return {'project_id': ours['project_id'], 'nodes': merged_nodes, 'links': links}, conflicts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Diff or three-way merge ThesisFlow projects.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_diff = sub.add_parser("diff", help="Show differences between two projects")
+    p_diff.add_argument("old"); p_diff.add_argument("new")
+    p_merge = sub.add_parser("merge", help="Merge two edited copies of a common base")
+    p_merge.add_argument("base"); p_merge.add_argument("ours"); p_merge.add_argument("theirs")
+    p_merge.add_argument("-o", "--output", required=True, help="Merged project file")
+    args = parser.parse_args(argv)
+
+    if args.command == "diff":
+        d = diff_projects(read_project(args.old), read_project(args.new))
+        for nid in d.added: print(f"+ node {nid}")
+        for nid in d.removed: print(f"- node {nid}")
+        for nid, changes in d.changed.items(): print(f"~ node {nid}: {', '.join(changes)}")
+        for rid in d.refs_added: print(f"+ reference {rid}")
+        for rid in d.refs_removed: print(f"- reference {rid}")
+        for rid in d.refs_changed: print(f"~ reference {rid}")
+        for p, c in d.links_added: print(f"+ link {p} -> {c}")
+        for p, c in d.links_removed: print(f"- link {p} -> {c}")
+        print(d.summary(), file=sys.stderr)
+        return 0 if d.is_empty() else 1
+
+    merged, conflicts = merge_projects(read_project(args.base), read_project(args.ours), read_project(args.theirs))
+    write_project(args.output, merged)
+    for c in conflicts: print(f"CONFLICT {c}")
+    print(f"Merged {len(merged['nodes'])} nodes, {len(merged['links'])} links; {len(conflicts)} conflict(s)",
+          file=sys.stderr)
+    return 1 if conflicts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,23 @@
 # ui/app_window.py
 import tkinter as tk
-from tkinter import messagebox, ttk, filedialog
-import xml.etree.ElementTree as ET
+from tkinter import messagebox
 import uuid
 import os
-import shutil
-import webbrowser
+import sys
+import math
 import constants
+# ttk, filedialog, xml.etree, shutil and webbrowser are imported where they are used,
+# so none of them is loaded before the first frame.
 
-from constants import COLORS, BASE_FONT_SIZE, BASE_NODE_WIDTH, BASE_NODE_HEIGHT
+from constants import COLORS, BASE_FONT_SIZE, ZOOM_MIN, ZOOM_MAX, CANVAS_MARGIN, GRID_STEP
 from objects.node import LogicNode
+from objects.model import Reference, IdRegistry
 from objects.connection import Connection
+from objects.graph import ReachabilityIndex
+from objects.analysis import ArgumentAnalyzer, FINDING_LABELS
+from objects.bounds import ContentBounds
+from ui.minimap import Minimap
+from ui.tasks import TaskManager, TaskStatusBar, current_task
 
 def resource_path(relative_path):
     """Akses resource saat di-pack PyInstaller"""
@@ -20,27 +27,85 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+def open_with_system_viewer(path):
+    try:
+        os.startfile(path) # Windows
+    except AttributeError:
+        import subprocess
+        subprocess.call(('xdg-open', path)) # Linux/Mac
+
 class ThesisFlowApp:
-    def __init__(self, root):
+    def __init__(self, root, timer=None, reopen_last=False, cache_last=False):
         self.root = root
+        self.timer = timer
+        self.cache_last = cache_last # Write the JSON last-project snapshot on open and save (opt-in)
+        self.on_startup_done = None # Callback run once the deferred startup work has finished
         self.root.title(f"{constants.TITLE} {constants.VERSION[0]}.{constants.VERSION[1]}.{constants.VERSION[2]}") 
         self.root.geometry("1400x800")
         self.icon_path = resource_path(constants.ICO_PATH)
         self.root.iconbitmap(self.icon_path)
         self.nodes = []
         self.connections = []
+        self.reach = ReachabilityIndex() # Arrow graph with cached descendant sets
+        self.bounds = ContentBounds() # Boxes of the visible nodes; drives the scroll region
+        self.scroll_region = (-CANVAS_MARGIN, -CANVAS_MARGIN, CANVAS_MARGIN, CANVAS_MARGIN)
+        self._region_pending = False
+        self.grid_area = None # Canvas area the current grid lines cover
+        self.collapsed_nodes = set()
+        self.hidden_nodes = set()
+        self.analysis = ArgumentAnalyzer() # Kept in sync with every edit; see refresh_analysis_view
+        self.findings_window = None
+        self.flagged_nodes = set()
+        self._analysis_pending = False
+        self.compare_window = None
         self.selected_object = None 
+        self.selected_objects = set()
         
         self.project_id = str(uuid.uuid4())
+        self.ids = IdRegistry() # Compact ids of this project's nodes and references
         
         self.zoom_level = 1.0
         self.drag_data = {"item": None, "x": 0, "y": 0, "mode": None}
         self.connect_mode = False
         self.connect_source = None
+        self.project_path = None
+        self.panels_built = False
+        self.tasks = TaskManager(self.root) # Slow file work runs here, off the Tk thread
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
 
         self.setup_menu()
+        self.mark_startup("menu")
         self.setup_ui()
         self.bind_shortcuts()
+        self.mark_startup("canvas ready")
+        # Everything not needed for the first frame runs once the window is up.
+        # after_idle alone can fire before the window is mapped, so wait for the canvas's first Expose
+        self.canvas.bind("<Expose>", lambda e: self.first_frame(reopen_last))
+
+    def mark_startup(self, phase):
+        if self.timer: self.timer.mark(phase)
+
+    def first_frame(self, reopen_last):
+        self.canvas.unbind("<Expose>")
+        self.mark_startup("first frame")
+        self.root.after_idle(lambda: self.finish_startup(reopen_last))
+
+    def finish_startup(self, reopen_last):
+        self.update_scrollregion()
+        self.refresh_grid(force=True)
+        self.mark_startup("grid")
+        if reopen_last:
+            # Loading may finish in the background; the phase ends once the map is on screen
+            self.reopen_last_project(then=self.startup_reopened)
+        elif self.on_startup_done: self.on_startup_done()
+
+    def startup_reopened(self):
+        self.mark_startup("reopen last project")
+        if self.on_startup_done: self.on_startup_done()
+
+    def exit_app(self):
+        self.tasks.shutdown()
+        self.root.destroy()
 
     def bind_shortcuts(self):
         self.root.bind("<Control-s>", lambda e: self.save_to_xml())
@@ -53,10 +118,17 @@ class ThesisFlowApp:
         file_menu.add_command(label="Save XML (Ctrl+S)", command=self.save_to_xml)
         file_menu.add_separator()
         file_menu.add_command(label="Export Bibliography", command=self.show_global_references)
+        file_menu.add_command(label="Export Image (SVG/PNG)...", command=self.export_image)
+        file_menu.add_command(label="Compare With...", command=self.compare_with_file)
+        file_menu.add_command(label="Import Outline (Markdown/OPML/DOT)...", command=self.import_outline)
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.exit_app)
         menubar.add_cascade(label="File", menu=file_menu)
 
+        analysis_menu = tk.Menu(menubar, tearoff=0)
+        analysis_menu.add_command(label="Check Argument Structure", command=self.show_findings)
+        menubar.add_cascade(label="Analysis", menu=analysis_menu)
+
         about_menu = tk.Menu(menubar, tearoff=0)
         about_menu.add_command(label="About", command=self.show_about)
         menubar.add_cascade(label="About", menu=about_menu)
@@ -67,33 +139,49 @@ class ThesisFlowApp:
         toolbar.pack(side=tk.TOP, fill=tk.X)
         tk.Button(toolbar, text="⌖ Center View", command=self.center_view).pack(side=tk.LEFT, padx=2, pady=2)
         tk.Button(toolbar, text="Default Zoom", command=self.reset_zoom).pack(side=tk.LEFT, padx=2, pady=2)
+        tk.Button(toolbar, text="⤢ Fit", command=self.fit_to_content).pack(side=tk.LEFT, padx=2, pady=2)
+        tk.Button(toolbar, text="▣ Minimap", command=lambda: self.minimap.toggle()).pack(side=tk.LEFT, padx=2, pady=2)
         self.lbl_zoom = tk.Label(toolbar, text="100%", width=5, fg="#555")
         self.lbl_zoom.pack(side=tk.LEFT, padx=2)
-        tk.Label(toolbar, text="| Drag Handle to Resize | Middle Click to Pan").pack(side=tk.LEFT, padx=10)
+        tk.Label(toolbar, text="| Drag Handle to Resize | Middle Click to Pan | Shift+Drag to Select").pack(side=tk.LEFT, padx=10)
+
+        # Packed before the canvas area so it keeps its line when the window shrinks
+        self.status_bar = TaskStatusBar(self.root, self.tasks)
+        self.status_bar.frame.pack(side=tk.BOTTOM, fill=tk.X)
 
         self.paned = tk.PanedWindow(self.root, orient=tk.HORIZONTAL, sashwidth=4, bg="#d9d9d9")
         self.paned.pack(fill=tk.BOTH, expand=True)
 
         left_frame = tk.Frame(self.paned)
-        self.canvas = tk.Canvas(left_frame, bg="white", scrollregion=(-10000, -10000, 10000, 10000))
+        self.canvas = tk.Canvas(left_frame, bg="white", scrollregion=self.scroll_region)
         h_scroll = tk.Scrollbar(left_frame, orient=tk.HORIZONTAL, command=self.canvas.xview)
         v_scroll = tk.Scrollbar(left_frame, orient=tk.VERTICAL, command=self.canvas.yview)
-        self.canvas.configure(xscrollcommand=h_scroll.set, yscrollcommand=v_scroll.set)
+        self.canvas.configure(xscrollcommand=lambda *a: self.on_view_scrolled(h_scroll, a),
+                              yscrollcommand=lambda *a: self.on_view_scrolled(v_scroll, a))
+        self.minimap = Minimap(self, self.canvas)
         
         h_scroll.pack(side=tk.BOTTOM, fill=tk.X)
         v_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.canvas.pack(fill=tk.BOTH, expand=True)
         self.paned.add(left_frame, minsize=800)
 
-        self._draw_grid()
         self.bind_canvas_events()
         self.center_view()
 
         self.right_panel = tk.Frame(self.paned, bd=2, relief=tk.SUNKEN, padx=5, pady=5)
         self.paned.add(self.right_panel, minsize=350)
+        # Property panels are built on first node selection (see ensure_right_panel)
+        self.lbl_panel_hint = tk.Label(self.right_panel, text="Select a node to edit its properties.", fg="#777")
+        self.lbl_panel_hint.pack(pady=20)
+
+    def ensure_right_panel(self):
+        if self.panels_built: return
+        self.lbl_panel_hint.destroy()
         self.setup_right_panel()
+        self.panels_built = True
 
     def setup_right_panel(self):
+        from tkinter import ttk
         # --- SECTION 1: NODE PROPERTIES ---
         sec1 = tk.LabelFrame(self.right_panel, text="Node Properties", padx=5, pady=5)
         sec1.pack(fill=tk.X, pady=(0, 10))
@@ -188,9 +276,8 @@ class ThesisFlowApp:
         tk.Button(btn_box_ref, text="Save / Update", command=self.save_reference, bg="#e6f3ff").pack(side=tk.LEFT, fill=tk.X, expand=True)
         tk.Button(btn_box_ref, text="🗑", command=self.remove_reference, width=3, bg="#ffcccc").pack(side=tk.LEFT, padx=(2, 0))
 
-        self.disable_all_panels()
-
     def open_link(self):
+        import webbrowser
         link = self.ent_ref_link.get().strip()
         if link:
             if not link.startswith("http"):
@@ -205,6 +292,8 @@ class ThesisFlowApp:
         self.ent_ref_title.focus_set()
 
     def browse_pdf(self):
+        from tkinter import filedialog
+        import shutil
         if not isinstance(self.selected_object, LogicNode): return
         
         file_path = filedialog.askopenfilename(
@@ -213,37 +302,37 @@ class ThesisFlowApp:
         )
         
         if file_path:
-            try:
-                filename = os.path.basename(file_path)
-                
-                # --- PERUBAHAN 2: Folder berdasarkan Node UUID ---
-                # Ambil ID dari node yang sedang dipilih
-                node_id = self.selected_object.id
-                
-                # Buat path: journal_files / {node_id} /
-                base_journal_dir = os.path.join(os.getcwd(), "journal_files")
-                target_dir = os.path.join(base_journal_dir, node_id)
-                
-                # Buat folder jika belum ada
-                if not os.path.exists(target_dir):
-                    os.makedirs(target_dir)
-                
-                # Set destinasi akhir
-                dest_path = os.path.join(target_dir, filename)
-                # -------------------------------------------------
+            filename = os.path.basename(file_path)
+            
+            # --- PERUBAHAN 2: Folder berdasarkan Node UUID ---
+            # Ambil ID dari node yang sedang dipilih
+            node = self.selected_object
+            node_id = node.uuid
+            
+            # Buat path: journal_files / {node_id} /
+            base_journal_dir = os.path.join(os.getcwd(), "journal_files")
+            target_dir = os.path.join(base_journal_dir, node_id)
+            
+            # Set destinasi akhir
+            dest_path = os.path.join(target_dir, filename)
+            # -------------------------------------------------
 
-                # Copy file
+            def copy():
+                # Buat folder jika belum ada
+                os.makedirs(target_dir, exist_ok=True)
                 if os.path.abspath(file_path) != os.path.abspath(dest_path):
                     shutil.copy2(file_path, dest_path)
-                
-                # Update UI
+
+            def copied(_):
+                # Update UI, unless another node was selected while the file was copying
+                if self.selected_object is not node: return
                 self.ent_ref_file.configure(state='normal')
                 self.ent_ref_file.delete(0, tk.END)
                 self.ent_ref_file.insert(0, filename)
                 self.ent_ref_file.configure(state='readonly')
-                
-            except Exception as e:
-                messagebox.showerror("File Error", f"Could not copy file: {e}")
+
+            self.tasks.submit(f"Copying {filename}", copy, on_done=copied,
+                              on_error=lambda e: messagebox.showerror("File Error", f"Could not copy file: {e}"))
     def open_pdf(self):
         filename = self.ent_ref_file.get()
         if not filename: return
@@ -252,34 +341,42 @@ class ThesisFlowApp:
         if not isinstance(self.selected_object, LogicNode): return
 
         # --- PERUBAHAN 3: Cari file di dalam folder UUID Node ---
-        node_id = self.selected_object.id
+        node_id = self.selected_object.uuid
         path = os.path.join(os.getcwd(), "journal_files", node_id, filename)
         # -------------------------------------------------------
         
-        if os.path.exists(path):
-            try:
-                os.startfile(path) # Windows
-            except AttributeError:
-                import subprocess
-                subprocess.call(('xdg-open', path)) # Linux/Mac
-        else:
+        if not os.path.exists(path):
             # Fallback: Coba cari di folder root journal_files (untuk kompatibilitas file lama)
             old_path = os.path.join(os.getcwd(), "journal_files", filename)
-            if os.path.exists(old_path):
-                try:
-                    os.startfile(old_path)
-                except AttributeError:
-                    import subprocess
-                    subprocess.call(('xdg-open', old_path))
-            else:
-                messagebox.showerror("Error", f"File not found in:\n{path}")
+            if not os.path.exists(old_path):
+                messagebox.showerror("Error", f"File not found in:\n{path}"); return
+            path = old_path
+        # Launching the viewer can take a while (and xdg-open may wait for it): not on the Tk thread
+        self.tasks.submit(f"Opening {filename}", open_with_system_viewer, path)
                 
-    def _draw_grid(self):
-        for i in range(-10000, 10000, 100):
-            self.canvas.create_line(i, -10000, i, 10000, fill="#f0f0f0", width=1)
-            self.canvas.create_line(-10000, i, 10000, i, fill="#f0f0f0", width=1)
-        self.canvas.create_line(0, -10000, 0, 10000, fill="#d0d0d0", width=2)
-        self.canvas.create_line(-10000, 0, 10000, 0, fill="#d0d0d0", width=2)
+    def refresh_grid(self, force=False):
+        """
+        Draws grid lines for the view plus one screen of slack on every side, and only
+        redraws once the view leaves that area: the canvas has no fixed extent to pre-draw.
+        """
+        vx1, vy1, vx2, vy2 = self.viewport()
+        a = self.grid_area
+        if not force and a and a[0] <= vx1 and a[1] <= vy1 and vx2 <= a[2] and vy2 <= a[3]: return
+        w, h = vx2 - vx1, vy2 - vy1
+        x1, y1, x2, y2 = vx1 - w, vy1 - h, vx2 + w, vy2 + h
+        self.canvas.delete("grid")
+        # Lines sit on multiples of GRID_STEP in the same frame as the nodes (see ContentBounds)
+        step = GRID_STEP * self.bounds.scale
+        ox, oy = self.bounds.ox, self.bounds.oy
+        for k in range(math.floor((x1 - ox) / step), math.ceil((x2 - ox) / step) + 1):
+            x = ox + k * step
+            self.canvas.create_line(x, y1, x, y2, fill="#d0d0d0" if k == 0 else "#f0f0f0", width=2 if k == 0 else 1, tags="grid")
+        for k in range(math.floor((y1 - oy) / step), math.ceil((y2 - oy) / step) + 1):
+            y = oy + k * step
+            self.canvas.create_line(x1, y, x2, y, fill="#d0d0d0" if k == 0 else "#f0f0f0", width=2 if k == 0 else 1, tags="grid")
+        # The grid is drawn after nodes: keep it underneath
+        self.canvas.tag_lower("grid")
+        self.grid_area = (x1, y1, x2, y2)
     
     def bind_canvas_events(self):
         self.canvas.bind("<Button-3>", self.context_menu)
@@ -290,32 +387,77 @@ class ThesisFlowApp:
         self.canvas.bind("<B2-Motion>", self.pan_move)
         self.canvas.bind("<Control-MouseWheel>", self.do_zoom)
         self.canvas.bind("<Motion>", self.on_mouse_move)
+        self.canvas.bind("<Configure>", lambda e: self.schedule_scrollregion())
+
+    def on_view_scrolled(self, scrollbar, args):
+        scrollbar.set(*args)
+        self.minimap.update_viewport()
+        self.schedule_scrollregion()
+
+    def viewport(self):
+        c = self.canvas
+        return c.canvasx(0), c.canvasy(0), c.canvasx(c.winfo_width()), c.canvasy(c.winfo_height())
+
+    def schedule_scrollregion(self):
+        """Coalesces scroll region and grid updates: many edits or scroll steps, one update."""
+        if not self._region_pending:
+            self._region_pending = True
+            self.root.after_idle(self.update_scrollregion)
+
+    def update_scrollregion(self, extra=None):
+        """
+        Sets the scroll region to the content box and the view (plus `extra`), with a margin
+        all around. The view is always inside, so changing the region never moves it, and
+        panning keeps extending it: there is no edge to run into.
+        """
+        self._region_pending = False
+        m = CANVAS_MARGIN
+        x1, y1, x2, y2 = self.viewport()
+        for box in (self.bounds.bbox(), extra):
+            if box: x1, y1, x2, y2 = min(x1, box[0]), min(y1, box[1]), max(x2, box[2]), max(y2, box[3])
+        # Rounded outward, so small scrolls and drags don't reconfigure the canvas each time
+        region = (math.floor((x1 - m) / GRID_STEP) * GRID_STEP, math.floor((y1 - m) / GRID_STEP) * GRID_STEP,
+                  math.ceil((x2 + m) / GRID_STEP) * GRID_STEP, math.ceil((y2 + m) / GRID_STEP) * GRID_STEP)
+        if region != self.scroll_region:
+            self.scroll_region = region
+            self.canvas.configure(scrollregion=region)
+        self.minimap.content_changed()
+        self.refresh_grid()
 
     def center_view(self):
-        if not self.nodes:
-            self.canvas.xview_moveto(0.5); self.canvas.yview_moveto(0.5); return
-        min_x, max_x = float('inf'), float('-inf')
-        min_y, max_y = float('inf'), float('-inf')
-        for node in self.nodes:
-            coords = self.canvas.coords(node.rect_id)
-            if coords:
-                if coords[0] < min_x: min_x = coords[0]
-                if coords[2] > max_x: max_x = coords[2]
-                if coords[1] < min_y: min_y = coords[1]
-                if coords[3] > max_y: max_y = coords[3]
-        content_cx = (min_x + max_x) / 2
-        content_cy = (min_y + max_y) / 2
+        box = self.bounds.bbox() # Kept up to date incrementally: no pass over the nodes
+        if box is None:
+            self.scroll_center_to(*self.bounds.to_canvas(0, 0)); return
+        self.scroll_center_to((box[0] + box[2]) / 2, (box[1] + box[3]) / 2)
+
+    def scroll_center_to(self, content_cx, content_cy):
         screen_w = self.canvas.winfo_width()
         screen_h = self.canvas.winfo_height()
         target_left = content_cx - (screen_w / 2)
         target_top = content_cy - (screen_h / 2)
-        region_min, region_total = -10000, 20000
-        self.canvas.xview_moveto((target_left - region_min) / region_total)
-        self.canvas.yview_moveto((target_top - region_min) / region_total)
+        # Grow the region first if the target view lies outside it
+        self.update_scrollregion(extra=(target_left, target_top, target_left + screen_w, target_top + screen_h))
+        rx1, ry1, rx2, ry2 = self.scroll_region
+        self.canvas.xview_moveto((target_left - rx1) / (rx2 - rx1))
+        self.canvas.yview_moveto((target_top - ry1) / (ry2 - ry1))
+
+    def fit_to_content(self):
+        """Zooms so the whole map fits the window (within the zoom limits) and centers it."""
+        box = self.bounds.bbox()
+        if box is None: self.center_view(); return
+        pad = 40
+        w, h = self.canvas.winfo_width() - 2 * pad, self.canvas.winfo_height() - 2 * pad
+        factor = min(w / max(1, box[2] - box[0]), h / max(1, box[3] - box[1]))
+        new_zoom = min(max(self.zoom_level * factor, ZOOM_MIN), ZOOM_MAX)
+        if abs(new_zoom - self.zoom_level) > 1e-9:
+            self.scale_canvas((box[0] + box[2]) / 2, (box[1] + box[3]) / 2, new_zoom / self.zoom_level)
+            self.zoom_level = new_zoom
+            self.update_ui_scaling()
+        self.center_view()
 
     def reset_zoom(self):
         scale_factor = 1.0 / self.zoom_level
-        self.canvas.scale("all", 0, 0, scale_factor, scale_factor)
+        self.scale_canvas(0, 0, scale_factor)
         self.zoom_level = 1.0
         self.update_ui_scaling()
         self.root.update_idletasks()
@@ -326,21 +468,40 @@ class ThesisFlowApp:
     def do_zoom(self, event):
         factor = 1.1 if event.delta > 0 else 0.9
         new_zoom = self.zoom_level * factor
-        if 0.2 < new_zoom < 3.0:
-            self.canvas.scale("all", self.canvas.canvasx(event.x), self.canvas.canvasy(event.y), factor, factor)
+        if ZOOM_MIN < new_zoom < ZOOM_MAX:
+            self.scale_canvas(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y), factor)
             self.zoom_level = new_zoom
             self.update_ui_scaling()
 
+    def scale_canvas(self, ox, oy, factor):
+        """Scales every canvas item, and the stored position of nodes that have no items."""
+        self.canvas.scale("all", ox, oy, factor, factor)
+        self.bounds.scaled(ox, oy, factor)
+        self.minimap.update_viewport() # Minimap items are in model units: only the view box changes
+        self.grid_area = None # Line spacing changed: redraw on the next update
+        self.schedule_scrollregion()
+        for node in self.hidden_nodes:
+            node.x = ox + (node.x - ox) * factor
+            node.y = oy + (node.y - oy) * factor
+
     def update_ui_scaling(self):
         percentage = int(self.zoom_level * 100)
         self.lbl_zoom.config(text=f"{percentage}%")
         new_fs = int(BASE_FONT_SIZE * self.zoom_level)
-        for t in self.canvas.find_withtag("text_content"): self.canvas.itemconfig(t, font=("Arial", new_fs))
         for t in self.canvas.find_withtag("text_label"): self.canvas.itemconfig(t, font=("Arial", int(new_fs*0.7), "bold"))
         for node in self.nodes:
+            if node.hidden: continue
             node.sync_coords(); node.update_text_wrapping()
-            if node == self.selected_object: node.draw_handle()
-        for conn in self.connections: conn.draw()
+            if node in self.selected_objects: node.draw_handle()
+            if node.badge_ids: node.draw_badge(node.badge_ids[2])
+        for conn in self.connections:
+            if not (conn.parent.hidden or conn.child.hidden): conn.draw()
+
+    def node_geometry_changed(self, node):
+        """Called by a node after it moved or resized on its own (not as part of a group drag)."""
+        self.update_connections(node)
+        self.minimap.node_changed(node)
+        self.bounds.set(node, node.model_box()); self.schedule_scrollregion()
 
     def update_connections(self, moved_node):
         for conn in self.connections:
@@ -360,50 +521,123 @@ class ThesisFlowApp:
         if self.connect_mode and self.connect_source:
             target = self.find_node_at(event.x, event.y)
             if target and target != self.connect_source:
-                self.connections.append(Connection(self, self.connect_source, target))
+                self.add_connection(self.connect_source, target)
             self.connect_mode = False; self.connect_source = None; self.canvas.config(cursor=""); return
 
+        shift = bool(event.state & 0x0001)
+        ctrl = bool(event.state & 0x0004)
         cx, cy = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
         items = self.canvas.find_overlapping(cx-2, cy-2, cx+2, cy+2)
         for item in items:
             tags = self.canvas.gettags(item)
             if "resize_grip" in tags:
-                if isinstance(self.selected_object, LogicNode):
-                    self.drag_data["mode"] = "resize"; self.drag_data["x"] = event.x; self.drag_data["y"] = event.y; return
-        if self.selected_object:
-            self.selected_object.set_selected(False); self.selected_object = None; self.disable_all_panels()
+                node = self.find_node_by_tags(tags)
+                if node:
+                    self.drag_data["mode"] = "resize"; self.drag_data["item"] = node
+                    self.drag_data["x"] = event.x; self.drag_data["y"] = event.y; return
         node = self.find_node_at(event.x, event.y)
         if node:
-            self.select_object(node)
-            self.drag_data["mode"] = "move"; self.drag_data["item"] = node; self.drag_data["x"] = event.x; self.drag_data["y"] = event.y; return
+            if ctrl:
+                # Ctrl+Click toggles membership without starting a drag
+                self.toggle_selection(node); return
+            if shift:
+                if node not in self.selected_objects: self.select_object(node, add=True)
+            elif node not in self.selected_objects:
+                self.clear_selection(); self.select_object(node)
+            else:
+                # Clicking inside the current group keeps it, but focuses the clicked node
+                self.focus_object(node)
+            self.begin_group_move(event)
+            return
         items = self.canvas.find_overlapping(cx-10, cy-10, cx+10, cy+10)
         for item_id in items:
             tags = self.canvas.gettags(item_id)
             if "connection" in tags:
                 for conn in self.connections:
-                    if conn.line_id == item_id: self.select_object(conn); return
+                    if conn.line_id == item_id:
+                        if ctrl: self.toggle_selection(conn); return
+                        if not shift: self.clear_selection()
+                        self.select_object(conn, add=shift); return
+        if shift or ctrl:
+            # Rubber-band selection, added to the current selection
+            self.drag_data["mode"] = "rubber"; self.drag_data["x"] = cx; self.drag_data["y"] = cy
+            self.drag_data["item"] = self.canvas.create_rectangle(
+                cx, cy, cx, cy, outline=COLORS["Selected"], dash=(4, 2), tags="rubber_band")
+            return
+        self.clear_selection()
         self.drag_data["mode"] = "pan"
         self.canvas.scan_mark(event.x, event.y)
-        
+
+    def begin_group_move(self, event):
+        """Tags every selected node with the shared `move` tag so a drag is one canvas call."""
+        self.canvas.dtag("move", "move")
+        group = self.selected_nodes()
+        for node in group:
+            self.canvas.addtag_withtag("move", node.tag)
+        # Each affected arrow is redrawn once per motion event, even if both ends move
+        self.drag_data["conns"] = [c for c in self.connections if c.parent in group or c.child in group]
+        self.drag_data["nodes"] = group
+        self.minimap.begin_group_move(group)
+        self.drag_data["moved"] = [0, 0]
+        self.drag_data["mode"] = "move"; self.drag_data["x"] = event.x; self.drag_data["y"] = event.y
+
     def on_drag(self, event):
         if self.drag_data["mode"] == "move":
-            node = self.drag_data["item"]
-            if node:
-                dx = (event.x - self.drag_data["x"]); dy = (event.y - self.drag_data["y"])
-                node.move(dx, dy)
-                self.drag_data["x"] = event.x; self.drag_data["y"] = event.y
+            dx = (event.x - self.drag_data["x"]); dy = (event.y - self.drag_data["y"])
+            if dx or dy:
+                self.canvas.move("move", dx, dy)
+                self.minimap.move_group(dx, dy)
+                for node in self.drag_data["nodes"]:
+                    node.x += dx; node.y += dy
+                self.drag_data["moved"][0] += dx; self.drag_data["moved"][1] += dy
+                for conn in self.drag_data["conns"]: conn.draw()
+            self.drag_data["x"] = event.x; self.drag_data["y"] = event.y
         elif self.drag_data["mode"] == "resize":
-            node = self.selected_object
+            node = self.drag_data["item"]
             if node and isinstance(node, LogicNode):
                 dx = (event.x - self.drag_data["x"]) / self.zoom_level
                 dy = (event.y - self.drag_data["y"]) / self.zoom_level
                 node.resize(node.width + dx, node.height + dy)
-                self.var_w.set(int(node.width)); self.var_h.set(int(node.height))
+                if node == self.selected_object:
+                    self.var_w.set(int(node.width)); self.var_h.set(int(node.height))
                 self.drag_data["x"] = event.x; self.drag_data["y"] = event.y
+        elif self.drag_data["mode"] == "rubber":
+            cx, cy = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+            self.canvas.coords(self.drag_data["item"], self.drag_data["x"], self.drag_data["y"], cx, cy)
         elif self.drag_data["mode"] == "pan":
             self.canvas.scan_dragto(event.x, event.y, gain=1)
             
-    def on_drop(self, event): self.drag_data["mode"] = None; self.drag_data["item"] = None
+    def on_drop(self, event):
+        if self.drag_data["mode"] == "move":
+            self.canvas.dtag("move", "move")
+            for node in self.drag_data["nodes"]: self.bounds.set(node, node.model_box())
+            self.move_hidden_subtrees(self.drag_data["nodes"], *self.drag_data["moved"])
+            self.schedule_scrollregion()
+        elif self.drag_data["mode"] == "rubber":
+            x1, y1, x2, y2 = self.canvas.coords(self.drag_data["item"])
+            self.canvas.delete(self.drag_data["item"])
+            self.select_in_rect(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        self.drag_data["mode"] = None; self.drag_data["item"] = None
+        self.drag_data.pop("nodes", None); self.drag_data.pop("conns", None); self.drag_data.pop("moved", None)
+
+    def move_hidden_subtrees(self, nodes, dx, dy):
+        """Hidden descendants of moved collapsed nodes keep their place relative to them (no canvas items to move)."""
+        if not (dx or dy) or not self.hidden_nodes: return
+        follow = set()
+        for node in nodes:
+            if node in self.collapsed_nodes and not node.hidden:
+                follow |= self.reach.descendants(node)
+        follow &= self.hidden_nodes
+        follow -= nodes
+        for node in follow:
+            node.x += dx; node.y += dy
+
+    def select_in_rect(self, x1, y1, x2, y2):
+        """Adds every node whose box intersects the rubber band to the selection."""
+        z = self.zoom_level
+        self.select_many([node for node in self.nodes if node not in self.selected_objects and not node.hidden
+                          and node.x <= x2 and node.x + node.width * z >= x1
+                          and node.y <= y2 and node.y + node.height * z >= y1])
 
     def populate_node_panel(self, node):
         self.var_type.set(node.node_type)
@@ -420,18 +654,60 @@ class ThesisFlowApp:
                 self.selected_object.resize(w, h)
             except: pass
 
-    def select_object(self, obj):   
-        self.selected_object = obj
+    def select_object(self, obj, add=False):
+        """Selects `obj`. With `add`, it joins the current selection instead of replacing it."""
+        if not add and self.selected_objects:
+            self.clear_selection()
+        self.selected_objects.add(obj)
         obj.set_selected(True)
+        self.focus_object(obj)
+
+    def select_many(self, objs):
+        """Adds `objs` to the selection; the side panel is filled once, for the last of them."""
+        for obj in objs:
+            self.selected_objects.add(obj)
+            obj.set_selected(True)
+        if objs: self.focus_object(objs[-1])
+
+    def focus_object(self, obj):
+        """Makes `obj` the primary selection shown in the property panels."""
+        self.selected_object = obj
         if isinstance(obj, LogicNode):
             self.enable_node_panel()
             self.populate_node_panel(obj)
         elif isinstance(obj, Connection):
             self.disable_all_panels()
 
+    def toggle_selection(self, obj):
+        if obj in self.selected_objects:
+            self.selected_objects.discard(obj)
+            obj.set_selected(False)
+            if obj == self.selected_object:
+                rest = self.selected_nodes()
+                if rest: self.focus_object(next(iter(rest)))
+                else: self.selected_object = None; self.disable_all_panels()
+        else:
+            self.select_object(obj, add=True)
+
+    def clear_selection(self):
+        for obj in self.selected_objects:
+            obj.set_selected(False)
+        self.selected_objects.clear()
+        if self.selected_object:
+            self.selected_object = None; self.disable_all_panels()
+
+    def selected_nodes(self):
+        return {o for o in self.selected_objects if isinstance(o, LogicNode)}
+
+    def find_node_by_tags(self, tags):
+        for node in self.nodes:
+            if node.tag in tags: return node
+        return None
+
     def find_node_at(self, sx, sy):
         cx, cy = self.canvas.canvasx(sx), self.canvas.canvasy(sy)
         for node in self.nodes:
+            if node.hidden: continue
             coords = self.canvas.coords(node.rect_id)
             if coords and coords[0] <= cx <= coords[2] and coords[1] <= cy <= coords[3]: return node
         return None
@@ -441,6 +717,10 @@ class ThesisFlowApp:
         node = self.find_node_at(event.x, event.y)
         if node:
             menu.add_command(label="Connect Arrow", command=lambda: self.start_connect(node))
+            if node.collapsed:
+                menu.add_command(label="Expand Subtree", command=lambda: self.set_collapsed(node, False))
+            elif self.reach.children.get(node):
+                menu.add_command(label="Collapse Subtree", command=lambda: self.set_collapsed(node, True))
             menu.add_command(label="Delete Node", command=lambda: self.delete_object(node))
         else:
             menu.add_command(label="Add Question", command=lambda: self.add_node("Question", event.x, event.y))
@@ -458,30 +738,48 @@ class ThesisFlowApp:
         for item in self.ref_tree.get_children():
             self.ref_tree.delete(item)
         for ref in node.references:
-            display_title = ref.get('title', '') or "(No Title)"
-            pdf = ref.get('file', '')
-            self.ref_tree.insert("", tk.END, iid=ref['id'], values=(display_title, ref['link'], pdf))
+            display_title = ref.title or "(No Title)"
+            self.ref_tree.insert("", tk.END, iid=str(ref.id), values=(display_title, ref.link, ref.file))
 
     def on_ref_select(self, event):
         selected_id = self.ref_tree.selection()
         if not selected_id: return
-        ref_id = selected_id[0]
+        ref_id = int(selected_id[0])
         if isinstance(self.selected_object, LogicNode):
-            ref_data = next((r for r in self.selected_object.references if r['id'] == ref_id), None)
+            ref_data = next((r for r in self.selected_object.references if r.id == ref_id), None)
             if ref_data:
-                self.ent_ref_title.delete(0, tk.END); self.ent_ref_title.insert(0, ref_data.get('title', ''))
-                self.ent_ref_link.delete(0, tk.END); self.ent_ref_link.insert(0, ref_data.get('link', ''))
+                self.ent_ref_title.delete(0, tk.END); self.ent_ref_title.insert(0, ref_data.title)
+                self.ent_ref_link.delete(0, tk.END); self.ent_ref_link.insert(0, ref_data.link)
                 self.ent_ref_file.configure(state='normal'); self.ent_ref_file.delete(0, tk.END)
-                self.ent_ref_file.insert(0, ref_data.get('file', '')); self.ent_ref_file.configure(state='readonly')
-                self.txt_ref_desc.delete("1.0", tk.END); self.txt_ref_desc.insert("1.0", ref_data.get('desc', ''))
+                self.ent_ref_file.insert(0, ref_data.file); self.ent_ref_file.configure(state='readonly')
+                self.txt_ref_desc.delete("1.0", tk.END); self.txt_ref_desc.insert("1.0", ref_data.desc)
 
     def save_node_details(self, event=None):
         if isinstance(self.selected_object, LogicNode):
-            self.selected_object.node_type = self.var_type.get()
+            self.retype_selection()
             self.selected_object.text = self.txt_argument.get("1.0", tk.END).strip()
+            self.analysis.text_changed(self.selected_object)
+            self.schedule_analysis_refresh()
             self.selected_object.update_visuals()
             return "break"
 
+    def retype_selection(self):
+        """Applies the type in `var_type` to every selected node using one tagged itemconfig."""
+        new_type = self.var_type.get()
+        group = [n for n in self.selected_nodes() if n.node_type != new_type]
+        if not group or new_type not in COLORS: return
+        self.canvas.dtag("retype", "retype"); self.canvas.dtag("retype_label", "retype_label")
+        for node in group:
+            node.node_type = new_type
+            self.analysis.set_type(node, new_type)
+            self.minimap.node_retyped(node)
+            self.canvas.addtag_withtag("retype", node.rect_id)
+            self.canvas.addtag_withtag("retype_label", node.type_id)
+        self.canvas.itemconfig("retype", fill=COLORS.get(new_type, "white"))
+        self.canvas.itemconfig("retype_label", text=f"[{new_type}]")
+        self.canvas.dtag("retype", "retype"); self.canvas.dtag("retype_label", "retype_label")
+        self.schedule_analysis_refresh()
+
     def save_reference(self, event=None):
         if not isinstance(self.selected_object, LogicNode): return
         link = self.ent_ref_link.get().strip()
@@ -491,14 +789,15 @@ class ThesisFlowApp:
 
         sel_id = self.ref_tree.selection()
         if sel_id:
-            ref_id = sel_id[0]
+            ref_id = int(sel_id[0])
             for ref in self.selected_object.references:
-                if ref['id'] == ref_id:
-                    ref['title'] = title; ref['link'] = link; ref['desc'] = desc; ref['file'] = file_path
+                if ref.id == ref_id:
+                    ref.title = title; ref.link = link; ref.desc = desc; ref.file = file_path
         else:
-            new_ref = {'id': str(uuid.uuid4()), 'title': title, 'link': link, 'desc': desc, 'file': file_path}
-            self.selected_object.references.append(new_ref)
+            self.selected_object.references.append(Reference(self.ids, title, link, file_path, desc))
         
+        self.analysis.set_ref_count(self.selected_object, len(self.selected_object.references))
+        self.schedule_analysis_refresh()
         self.refresh_ref_tree(self.selected_object)
         self.clear_ref_details()
         return "break"
@@ -507,9 +806,16 @@ class ThesisFlowApp:
         if not isinstance(self.selected_object, LogicNode): return
         sel_id = self.ref_tree.selection()
         if sel_id:
-            ref_id = sel_id[0]
-            self.selected_object.references = [r for r in self.selected_object.references if r['id'] != ref_id]
-            self.refresh_ref_tree(self.selected_object)
+            ref_id = int(sel_id[0])
+            node = self.selected_object
+            kept = []
+            for r in node.references:
+                if r.id == ref_id: r.registry.release(r.id)
+                else: kept.append(r)
+            node.references = kept
+            self.analysis.set_ref_count(node, len(kept))
+            self.schedule_analysis_refresh()
+            self.refresh_ref_tree(node)
             self.clear_ref_details()
 
     def clear_ref_details(self):
@@ -521,12 +827,14 @@ class ThesisFlowApp:
             self.ref_tree.selection_remove(self.ref_tree.selection())
 
     def disable_all_panels(self):
+        if not self.panels_built: return
         for child in self.right_panel.winfo_children():
             for sub in child.winfo_children():
                 try: sub.configure(state='disabled') 
                 except: pass
 
     def enable_node_panel(self):
+        self.ensure_right_panel()
         for child in self.right_panel.winfo_children():
             for sub in child.winfo_children():
                 try: sub.configure(state='normal')
@@ -535,126 +843,525 @@ class ThesisFlowApp:
         self.ent_ref_file.configure(state='readonly') 
 
     def delete_selected_object(self):
-        if self.selected_object:
-            self.delete_object(self.selected_object)
-            self.selected_object = None; self.disable_all_panels()
+        if self.selected_objects:
+            group = list(self.selected_objects)
+            self.clear_selection()
+            self.delete_objects(group)
 
     def delete_object(self, obj):
-        if isinstance(obj, Connection):
-            obj.delete()
-            if obj in self.connections: self.connections.remove(obj)
-        elif isinstance(obj, LogicNode):
-            self.canvas.delete(obj.rect_id); self.canvas.delete(obj.text_id); self.canvas.delete(obj.type_id)
-            obj.set_selected(False) 
-            to_remove = [c for c in self.connections if c.parent == obj or c.child == obj]
-            for c in to_remove:
-                c.delete(); self.connections.remove(c)
-            if obj in self.nodes: self.nodes.remove(obj)
+        self.delete_objects([obj])
+
+    def delete_objects(self, objs):
+        """Removes nodes and arrows in one pass; every dropped arrow is deleted exactly once."""
+        nodes = {o for o in objs if isinstance(o, LogicNode)}
+        dead = {o for o in objs if isinstance(o, Connection)}
+        for obj in nodes | dead:
+            if obj in self.selected_objects:
+                self.selected_objects.discard(obj)
+                if obj == self.selected_object: self.selected_object = None; self.disable_all_panels()
+        if nodes:
+            dead.update(c for c in self.connections if c.parent in nodes or c.child in nodes)
+        for c in dead:
+            c.delete(); self.reach.remove_edge(c.parent, c.child)
+            self.analysis.remove_edge(c.parent, c.child)
+        for node in nodes:
+            node.set_selected(False)
+            node.release()
+            # Ids go back to the registry for reuse; nothing refers to this node any more
+            for r in node.references: r.registry.release(r.id)
+            node.registry.release(node.id)
+            self.minimap.node_removed(node)
+            self.bounds.discard(node)
+            self.reach.remove_node(node)
+            self.analysis.remove_node(node)
+            self.flagged_nodes.discard(node)
+            self.collapsed_nodes.discard(node); self.hidden_nodes.discard(node)
+        if dead: self.connections = [c for c in self.connections if c not in dead]
+        if nodes: self.nodes = [n for n in self.nodes if n not in nodes]
+        # Also when the last collapsed node went: its subtree must come back
+        if (dead or nodes) and (self.collapsed_nodes or self.hidden_nodes): self.refresh_collapsed()
+        if nodes: self.schedule_scrollregion()
+        self.schedule_analysis_refresh()
+
+    def add_connection(self, parent, child):
+        conn = Connection(self, parent, child)
+        self.connections.append(conn)
+        self.reach.add_edge(parent, child)
+        self.analysis.add_edge(parent, child)
+        if self.collapsed_nodes: self.refresh_collapsed()
+        self.schedule_analysis_refresh()
+        return conn
+
+    def set_collapsed(self, node, collapsed=True):
+        node.collapsed = collapsed
+        if collapsed: self.collapsed_nodes.add(node)
+        else: self.collapsed_nodes.discard(node); node.clear_badge()
+        self.refresh_collapsed()
+
+    def refresh_collapsed(self):
+        """
+        Releases canvas items of every node under a collapsed node and redraws nodes
+        that became visible again. Descendant sets come from the reachability cache.
+        """
+        hidden = set()
+        for node in self.collapsed_nodes:
+            hidden |= self.reach.descendants(node) - {node}
+        newly_hidden = hidden - self.hidden_nodes
+        shown = self.hidden_nodes - hidden
+        if newly_hidden:
+            for node in newly_hidden & self.selected_objects:
+                self.toggle_selection(node)
+        for node in newly_hidden:
+            node.release(); self.minimap.node_removed(node); self.bounds.discard(node)
+        for node in shown:
+            node.draw(); self.minimap.node_added(node); self.bounds.set(node, node.model_box())
+        if newly_hidden or shown: self.schedule_scrollregion()
+        self.hidden_nodes = hidden
+        if newly_hidden or shown:
+            changed = newly_hidden | shown
+            for conn in self.connections:
+                if conn.parent in changed or conn.child in changed:
+                    if conn in self.selected_objects and (conn.parent.hidden or conn.child.hidden):
+                        self.toggle_selection(conn)
+                    conn.draw()
+        for node in self.collapsed_nodes:
+            if node.hidden: continue
+            count = len(self.reach.descendants(node) - {node})
+            if not node.badge_ids or node.badge_ids[2] != count: node.draw_badge(count)
 
     def add_node(self, n_type, x, y):
         cx, cy = self.canvas.canvasx(x), self.canvas.canvasy(y)
         node = LogicNode(self, cx, cy, n_type)
+        self.register_node(node)
+
+    def register_node(self, node):
         self.nodes.append(node)
+        self.analysis.add_node(node, node.node_type, len(node.references))
+        self.minimap.node_added(node)
+        if not node.hidden: self.bounds.set(node, node.model_box()); self.schedule_scrollregion()
+        self.schedule_analysis_refresh()
+
+    def insert_records(self, project, dx=0, dy=0):
+        """
+        Batched creation of the nodes and arrows of a project record (see objects.project_file).
+        Model objects come first; graph indexes are extended once; then all canvas items are
+        created in one Tcl call for the nodes and one for the arrows. Records are in model
+        units and are placed at the current zoom, offset by (dx, dy) canvas pixels.
+        Returns the new nodes.
+        """
+        new_nodes, new_conns = self.build_model(project, self.ids, self.zoom_level, dx, dy)
+        self.reach.add_edges((c.parent, c.child) for c in new_conns)
+        self.analysis.add_nodes(((n, n.node_type, len(n.references)) for n in new_nodes),
+                                ((c.parent, c.child) for c in new_conns))
+        self.show_built(new_nodes, new_conns)
+        return new_nodes
+
+    def build_model(self, project, registry, zoom, dx=0, dy=0):
+        """
+        Undrawn LogicNode / Connection objects for a project record, with ids from `registry`.
+        Makes no Tk calls and changes no app state, so it may run in a worker thread.
+        """
+        new_nodes = []
+        by_id = {}
+        for rec in project['nodes']:
+            node = LogicNode(self, rec['x'] * zoom + dx, rec['y'] * zoom + dy, rec['type'], text=rec['text'],
+                             node_id=registry.from_uuid(rec['id']), width=rec['w'], height=rec['h'], draw=False,
+                             registry=registry)
+            node.references = [Reference.from_record(registry, r) for r in rec['references']]
+            node.collapsed = rec.get('collapsed', False)
+            new_nodes.append(node)
+            by_id[rec['id']] = node
+        new_conns = [Connection(self, by_id[pid], by_id[cid], draw=False)
+                     for pid, cid in project['links'] if pid in by_id and cid in by_id]
+        return new_nodes, new_conns
+
+    def build_map(self, project):
+        """
+        Everything open_project needs that does not touch Tk: model objects at zoom 1 and
+        fresh graph indexes. Runs in the loading worker.
+        """
+        registry = IdRegistry()
+        nodes, conns = self.build_model(project, registry, 1.0)
+        reach = ReachabilityIndex()
+        reach.add_edges((c.parent, c.child) for c in conns)
+        analysis = ArgumentAnalyzer()
+        analysis.load(((n, n.node_type, len(n.references)) for n in nodes), ((c.parent, c.child) for c in conns))
+        return registry, nodes, conns, reach, analysis
+
+    def show_built(self, new_nodes, new_conns):
+        """Registers built, indexed nodes and arrows with the app and draws them (Tk thread)."""
+        self.nodes.extend(new_nodes)
+        self.connections.extend(new_conns)
+
+        # Nodes that start inside a collapsed subtree never get canvas items
+        self.collapsed_nodes.update(n for n in new_nodes if n.collapsed)
+        hidden = set()
+        for node in self.collapsed_nodes:
+            hidden |= self.reach.descendants(node) - {node}
+        for node in new_nodes:
+            if node in hidden: node.hidden = True; self.hidden_nodes.add(node)
+        shown = [n for n in new_nodes if not n.hidden]
+        LogicNode.draw_many(self, shown)
+        Connection.draw_many(self, new_conns)
+        self.minimap.nodes_added(shown)
+        for node in shown: self.bounds.set(node, node.model_box())
+        self.schedule_scrollregion()
+        if self.collapsed_nodes: self.refresh_collapsed()
+        self.schedule_analysis_refresh()
 
     def save_to_xml(self):
+        from tkinter import filedialog
+        from objects.project_file import write_project, write_snapshot
         path = filedialog.asksaveasfilename(defaultextension=".xml", filetypes=[("XML", "*.xml")])
         if not path: return
         
-        root = ET.Element("ThesisFlow", project_id=self.project_id)
-        
-        for n in self.nodes:
-            # --- PERBAIKAN: Normalisasi Koordinat ---
-            # Kembalikan koordinat visual ke skala 1.0 sebelum disimpan
-            # agar sinkron dengan width/height yang memang berskala 1.0
-            norm_x = n.x / self.zoom_level
-            norm_y = n.y / self.zoom_level
-            # ----------------------------------------
-
-            ne = ET.SubElement(root, "Node", id=n.id, type=n.node_type, 
-                               x=str(norm_x), y=str(norm_y), # Gunakan norm_x dan norm_y
-                               w=str(n.width), h=str(n.height))
-            
-            ET.SubElement(ne, "Text").text = n.text
-            re = ET.SubElement(ne, "References")
-            for ref in n.references:
-                r_item = ET.SubElement(re, "Ref", id=ref['id'])
-                ET.SubElement(r_item, "Title").text = ref.get('title', '')
-                ET.SubElement(r_item, "Link").text = ref.get('link', '')
-                ET.SubElement(r_item, "File").text = ref.get('file', '')
-                ET.SubElement(r_item, "Desc").text = ref.get('desc', '')
-        
-        ce_root = ET.SubElement(root, "Connections")
-        for c in self.connections:
-            ET.SubElement(ce_root, "Link", parent=c.parent.id, child=c.child.id)
-            
-        try:
-            ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+        # The records are taken on the Tk thread; building and writing the XML is not
+        project = self.snapshot_project()
+        def write():
+            write_project(path, project)
+            if not self.cache_last: return
+            try: write_snapshot(project, path)
+            except OSError: pass # The cache is optional
+        def saved(_):
+            self.project_path = path
             messagebox.showinfo("Saved", "File saved successfully!")
-        except Exception as e: messagebox.showerror("Error", str(e))
-    def load_from_xml(self):
-        path = filedialog.askopenfilename(filetypes=[("XML", "*.xml")])
+        # Serial: saves land in the order they were made. Not cancellable halfway through a write
+        self.tasks.submit(f"Saving {os.path.basename(path)}", write, on_done=saved,
+                          on_error=lambda e: messagebox.showerror("Error", str(e)), serial=True, cancellable=False)
+
+    def load_from_xml(self, path=None, then=None):
+        """Opens a project file in the background; `then()` runs once it is shown or has failed."""
+        from tkinter import filedialog
+        from objects.project_file import read_project, write_snapshot
+        if path is None:
+            path = filedialog.askopenfilename(filetypes=[("XML", "*.xml")])
         if not path: return
-        
+        def load():
+            project = read_project(path)
+            current_task().report(None, "building map")
+            return project, self.build_map(project)
+        def loaded(result):
+            project, built = result
+            if self.open_project(project, path, built) and self.cache_last:
+                self.tasks.submit("Caching project", write_snapshot, project, path, on_error=lambda e: None)
+            if then: then()
+        def failed(e):
+            messagebox.showerror("Error", str(e))
+            if then: then()
+        # Parsing and the model build both run in the worker; the Tk thread only draws
+        self.tasks.submit(f"Opening {os.path.basename(path)}", load, on_done=loaded, on_error=failed)
+
+    def reopen_last_project(self, then=None):
+        """Reopens the last project from its JSON snapshot, or from the XML if it changed since."""
+        from objects.project_file import read_snapshot
+        def load():
+            source, project = read_snapshot()
+            return source, project, self.build_map(project) if project is not None else None
+        def loaded(result):
+            source, project, built = result
+            if project is None and source is not None:
+                self.load_from_xml(source, then=then); return
+            if project is not None: self.open_project(project, source, built)
+            if then: then()
+        def failed(e):
+            if then: then() # No usable snapshot: start with an empty map
+        self.tasks.submit("Reopening last project", load, on_done=loaded, on_error=failed)
+
+    def open_project(self, project, path, built=None):
+        """
+        Replaces the current map with a project record (see objects.project_file).
+        `built` is the result of build_map when a worker already made the model.
+        """
         # --- PERBAIKAN UTAMA: Reset Zoom & View sebelum load ---
         # Ini penting agar node digambar pada skala 1:1 yang benar
         self.reset_zoom() 
         # -------------------------------------------------------
 
         try:
-            tree = ET.parse(path)
-            root = tree.getroot()
-            
+            if built is None: built = self.build_map(project)
             # Load Project ID
-            self.project_id = root.get('project_id', str(uuid.uuid4()))
+            self.project_id = project['project_id']
+            self.project_path = path
             
             # Hapus node lama
-            for n in list(self.nodes): self.delete_object(n)
-            
-            id_map = {}
-            for ne in root.findall("Node"):
-                w = float(ne.get('w')) if ne.get('w') else BASE_NODE_WIDTH
-                h = float(ne.get('h')) if ne.get('h') else BASE_NODE_HEIGHT
-                
-                # Pastikan LogicNode menerima parameter node_id dengan benar
-                node = LogicNode(self, float(ne.get('x')), float(ne.get('y')), ne.get('type'), 
-                                 text=ne.find("Text").text or "", node_id=ne.get('id'), width=w, height=h)
-                
-                ref_container = ne.find("References")
-                if ref_container is not None:
-                    for r_xml in ref_container.findall("Ref"):
-                        f_node = r_xml.find("File")
-                        f_text = f_node.text if (f_node is not None) else ""
-                        node.references.append({
-                            'id': r_xml.get('id', str(uuid.uuid4())),
-                            'title': r_xml.find("Title").text or "",
-                            'link': r_xml.find("Link").text or "",
-                            'file': f_text,
-                            'desc': r_xml.find("Desc").text or ""
-                        })
-                node.update_visuals()
-                self.nodes.append(node)
-                id_map[node.id] = node
-            
-            conn_root = root.find("Connections")
-            if conn_root is not None:
-                for link in conn_root.findall("Link"):
-                    pid, cid = link.get("parent"), link.get("child")
-                    if pid in id_map and cid in id_map:
-                        self.connections.append(Connection(self, id_map[pid], id_map[cid]))
-            
+            if self.compare_window: self.close_comparison()
+            self.clear_selection()
+            self.delete_objects(list(self.nodes))
+
+            # The new map comes with its own id registry and graph indexes
+            self.ids, nodes, conns, self.reach, analysis = built
+            analysis.version = self.analysis.version + 1 # Views compare versions to skip refreshes
+            self.analysis = analysis
+            self.show_built(nodes, conns)
             self.center_view()
-        except Exception as e: messagebox.showerror("Error", str(e))
+            return True
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return False
         
+    def import_outline(self, path=None):
+        """Adds the nodes of a Markdown, OPML or Graphviz file, laid out to the right of the view."""
+        from tkinter import filedialog
+        from tools.importers import import_file, IMPORT_FILETYPES
+        if path is None:
+            path = filedialog.askopenfilename(filetypes=IMPORT_FILETYPES)
+        if not path: return
+        try:
+            project = import_file(path)
+        except Exception as e: messagebox.showerror("Import Error", str(e)); return
+        if not project['nodes']:
+            messagebox.showinfo("Import", "Nothing to import was found in this file."); return
+        # Place the outline's top-left corner near the top-left of the visible area
+        dx, dy = self.canvas.canvasx(40), self.canvas.canvasy(40)
+        new_nodes = self.insert_records(project, dx, dy)
+        self.clear_selection()
+        self.select_object(new_nodes[0])
+
+    def snapshot_project(self):
+        """Plain-record copy of the map (same shape as objects.project_file.read_project)."""
+        nodes = []
+        for n in self.nodes:
+            nodes.append({
+                'id': n.uuid, 'type': n.node_type,
+                # Kembalikan koordinat visual ke skala 1.0 (width/height are stored at 1.0)
+                # Rounded: zooming in and out again must not look like a move to diff / merge
+                'x': round(n.x / self.zoom_level, 2), 'y': round(n.y / self.zoom_level, 2),
+                'w': n.width, 'h': n.height, 'text': n.text, 'collapsed': n.collapsed,
+                'references': [r.to_record() for r in n.references],
+            })
+        links = [(c.parent.uuid, c.child.uuid) for c in self.connections]
+        return {'project_id': self.project_id, 'nodes': nodes, 'links': links}
+
+    def export_image(self):
+        """Asks for scope and DPI, then renders the map off-screen (see tools.image_export)."""
+        from tools.image_export import build_scene, export_scene
+
+        top = tk.Toplevel(self.root)
+        top.title("Export Image")
+        top.transient(self.root)
+        var_scope = tk.StringVar(value="selection" if self.selected_nodes() else "full")
+        tk.Label(top, text="Scope:").grid(row=0, column=0, sticky="w", padx=5, pady=2)
+        for i, (label, value) in enumerate((("Full Map", "full"), ("Selection", "selection"), ("Viewport", "viewport"))):
+            tk.Radiobutton(top, text=label, variable=var_scope, value=value).grid(row=0, column=i + 1, sticky="w")
+        tk.Label(top, text="DPI (SVG: size only):").grid(row=1, column=0, sticky="w", padx=5, pady=2)
+        var_dpi = tk.IntVar(value=300)
+        tk.Entry(top, textvariable=var_dpi, width=6).grid(row=1, column=1, sticky="w")
+
+        def run():
+            try: dpi = max(10, var_dpi.get())
+            except tk.TclError: dpi = 300
+            scope = var_scope.get()
+            top.destroy()
+            from tkinter import filedialog
+            path = filedialog.asksaveasfilename(defaultextension=".svg",
+                                                filetypes=[("SVG", "*.svg"), ("PNG", "*.png")])
+            if not path: return
+            project = self.snapshot_project()
+            z = self.zoom_level
+            options = {}
+            if scope == "selection":
+                options['ids'] = {n.uuid for n in self.selected_nodes()}
+            elif scope == "viewport":
+                x1, y1 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+                x2 = self.canvas.canvasx(self.canvas.winfo_width()); y2 = self.canvas.canvasy(self.canvas.winfo_height())
+                options['region'] = (x1 / z, y1 / z, x2 / z, y2 / z)
+
+            def render():
+                task = current_task()
+                scene = build_scene(project, scope, **options)
+                try:
+                    export_scene(scene, path, dpi, progress=task.report)
+                except Exception:
+                    # Cancelled or failed: don't leave half an image behind
+                    try: os.remove(path)
+                    except OSError: pass
+                    raise
+            self.tasks.submit(f"Exporting {os.path.basename(path)}", render,
+                              on_done=lambda _: messagebox.showinfo("Exported", f"Image saved to:\n{path}"),
+                              on_error=lambda e: messagebox.showerror("Export Error", str(e)))
+
+        tk.Button(top, text="Export...", command=run, bg="#e6f3ff").grid(row=2, column=0, columnspan=4, sticky="ew", padx=5, pady=5)
+
+    def show_findings(self):
+        """Opens the (non-modal) findings list and turns on canvas highlights."""
+        if self.findings_window:
+            self.findings_window.lift(); return
+        top = tk.Toplevel(self.root)
+        top.title("Argument Structure")
+        top.geometry("520x300")
+        self.lst_findings = tk.Listbox(top, activestyle="none")
+        sb = tk.Scrollbar(top, orient=tk.VERTICAL, command=self.lst_findings.yview)
+        self.lst_findings.configure(yscrollcommand=sb.set)
+        sb.pack(side=tk.RIGHT, fill=tk.Y)
+        self.lst_findings.pack(fill=tk.BOTH, expand=True)
+        self.lst_findings.bind("<<ListboxSelect>>", self.on_finding_select)
+        top.protocol("WM_DELETE_WINDOW", self.close_findings)
+        self.findings_window = top
+        self.findings_rows = [] # Analyzer row ids, in list order
+        self.findings_keys = [] # Nodes of each row
+        self.analysis.stop_changes() # The first refresh builds the whole list
+        self._analysis_version = None
+        self.refresh_analysis_view()
+
+    def close_findings(self):
+        self.findings_window.destroy(); self.findings_window = None
+        self.analysis.stop_changes()
+        for node in self.flagged_nodes: node.set_flagged(False)
+        self.flagged_nodes = set()
+
+    def schedule_analysis_refresh(self):
+        """Coalesces view updates: many edits in one event produce a single refresh."""
+        if self.findings_window and not self._analysis_pending:
+            self._analysis_pending = True
+            self.root.after_idle(self.refresh_analysis_view)
+
+    def refresh_analysis_view(self):
+        """Updates only the finding rows (and dashed outlines) that changed since the last refresh."""
+        self._analysis_pending = False
+        if not self.findings_window or self._analysis_version == self.analysis.version: return
+        self._analysis_version = self.analysis.version
+        changes = self.analysis.take_changes()
+        if changes is None:
+            self.rebuild_findings_list(); return
+
+        lst = self.lst_findings
+        if lst.size() > len(self.findings_rows): lst.delete(0, tk.END) # "No problems found."
+        affected = set()
+        for row in changes:
+            finding = self.analysis.finding(row)
+            try: i = self.findings_rows.index(row)
+            except ValueError: i = None
+            if i is not None:
+                affected.update(self.findings_keys[i])
+                lst.delete(i)
+                if finding is None:
+                    del self.findings_rows[i]; del self.findings_keys[i]; continue
+                lst.insert(i, self.finding_label(*finding))
+                self.findings_keys[i] = finding[1]
+            elif finding is not None:
+                lst.insert(tk.END, self.finding_label(*finding))
+                self.findings_rows.append(row); self.findings_keys.append(finding[1])
+            if finding is not None: affected.update(finding[1])
+        if not self.findings_rows: lst.insert(tk.END, "No problems found.")
+
+        for node in affected:
+            on = node in self.analysis.types and bool(self.analysis.status(node))
+            if on == (node in self.flagged_nodes): continue
+            node.set_flagged(on)
+            if on: self.flagged_nodes.add(node)
+            else: self.flagged_nodes.discard(node)
+
+    def rebuild_findings_list(self):
+        flagged = self.analysis.flagged()
+        for node in self.flagged_nodes - flagged: node.set_flagged(False)
+        for node in flagged - self.flagged_nodes: node.set_flagged(True)
+        self.flagged_nodes = flagged
+
+        self.lst_findings.delete(0, tk.END)
+        self.findings_rows = self.analysis.rows()
+        self.findings_keys = []
+        for row in self.findings_rows:
+            kind, nodes = self.analysis.finding(row)
+            self.lst_findings.insert(tk.END, self.finding_label(kind, nodes))
+            self.findings_keys.append(nodes)
+        if not self.findings_keys:
+            self.lst_findings.insert(tk.END, "No problems found.")
+
+    @staticmethod
+    def finding_label(kind, nodes):
+        first = nodes[0].text.strip().split("\n", 1)[0][:40]
+        extra = f" (+{len(nodes) - 1} more)" if len(nodes) > 1 else ""
+        return f"{FINDING_LABELS[kind]}: {first}{extra}"
+
+    def on_finding_select(self, event):
+        sel = self.lst_findings.curselection()
+        if not sel or sel[0] >= len(self.findings_keys): return
+        nodes = [n for n in self.findings_keys[sel[0]] if not n.hidden]
+        if not nodes: return
+        self.clear_selection()
+        self.select_many(nodes)
+        cx, cy = nodes[0].get_center()
+        self.scroll_center_to(cx, cy)
+
+    def compare_with_file(self, path=None):
+        """Diffs the open map against another project file and highlights the differences."""
+        from tkinter import filedialog
+        from objects.project_file import read_project
+        from tools.merge import diff_projects
+        if path is None:
+            path = filedialog.askopenfilename(filetypes=[("XML", "*.xml")])
+        if not path: return
+        current = self.snapshot_project() # Taken on the Tk thread; the worker reads and diffs
+        def compare():
+            other = read_project(path)
+            return other, diff_projects(other, current)
+        self.tasks.submit(f"Reading {os.path.basename(path)}", compare,
+                          on_done=lambda result: self.show_comparison(*result, path),
+                          on_error=lambda e: messagebox.showerror("Error", str(e)))
+
+    def show_comparison(self, other, diff, path):
+        if self.compare_window: self.close_comparison()
+        top = tk.Toplevel(self.root)
+        top.title(f"Compare With {os.path.basename(path)}")
+        top.geometry("520x300")
+        tk.Label(top, text=diff.summary(), anchor="w").pack(fill=tk.X, padx=5)
+        self.lst_diff = tk.Listbox(top, activestyle="none")
+        sb = tk.Scrollbar(top, orient=tk.VERTICAL, command=self.lst_diff.yview)
+        self.lst_diff.configure(yscrollcommand=sb.set)
+        sb.pack(side=tk.RIGHT, fill=tk.Y)
+        self.lst_diff.pack(fill=tk.BOTH, expand=True)
+        self.lst_diff.bind("<<ListboxSelect>>", self.on_diff_select)
+        top.protocol("WM_DELETE_WINDOW", self.close_comparison)
+        self.compare_window = top
+
+        # Overlays are plain canvas items tagged "diff": zoom scales them with everything else
+        z = self.zoom_level
+        by_uuid = {n.uuid: n for n in self.nodes}
+        theirs = {rec['id']: rec for rec in other['nodes']}
+        self.diff_targets = [] # Canvas point to scroll to, per list row
+        def outline(x1, y1, x2, y2, color, dash=()):
+            self.canvas.create_rectangle(x1 - 4, y1 - 4, x2 + 4, y2 + 4, outline=color, width=3, dash=dash, tags="diff")
+        def add_row(label, text, target):
+            first = text.strip().split("\n", 1)[0][:40]
+            self.lst_diff.insert(tk.END, f"{label}: {first}")
+            self.diff_targets.append(target)
+
+        for uid in diff.added:
+            node = by_uuid[uid]
+            if not node.hidden: outline(*node.get_box(), COLORS["DiffAdded"])
+            add_row("Only here", node.text, (node.x, node.y) if node.hidden else node.get_center())
+        for uid, changes in diff.changed.items():
+            node = by_uuid[uid]
+            if not node.hidden: outline(*node.get_box(), COLORS["DiffChanged"])
+            add_row(f"Changed ({', '.join(changes)})", node.text, (node.x, node.y) if node.hidden else node.get_center())
+        for uid in diff.removed:
+            rec = theirs[uid]
+            x1, y1 = rec['x'] * z, rec['y'] * z
+            x2, y2 = x1 + rec['w'] * z, y1 + rec['h'] * z
+            outline(x1, y1, x2, y2, COLORS["DiffRemoved"], dash=(6, 4))
+            add_row("Only in file", rec['text'], ((x1 + x2) / 2, (y1 + y2) / 2))
+        if diff.is_empty():
+            self.lst_diff.insert(tk.END, "No differences.")
+
+    def close_comparison(self):
+        self.compare_window.destroy(); self.compare_window = None
+        self.canvas.delete("diff")
+
+    def on_diff_select(self, event):
+        sel = self.lst_diff.curselection()
+        if not sel or sel[0] >= len(self.diff_targets): return
+        self.scroll_center_to(*self.diff_targets[sel[0]])
+
     def show_global_references(self):
         lines = ["--- BIBLIOGRAPHY EXPORT ---", ""]
         for n in self.nodes:
             if n.references:
                 lines.append(f"[{n.node_type}] {n.text}")
                 for r in n.references:
-                    file_info = f" [PDF: {r.get('file')}]" if r.get('file') else ""
-                    lines.append(f"   • {r['title']} ({r['link']}){file_info}")
-                    if r['desc']:
-                        desc_lines = r['desc'].split('\n')
+                    file_info = f" [PDF: {r.file}]" if r.file else ""
+                    lines.append(f"   • {r.title} ({r.link}){file_info}")
+                    if r.desc:
+                        desc_lines = r.desc.split('\n')
                         for i, line in enumerate(desc_lines):
                             prefix = "     Note: " if i == 0 else "           "
                             lines.append(f"{prefix}{line}")
@@ -0,0 +1,139 @@
+# ui/minimap.py
+import math
+import tkinter as tk
+from constants import COLORS, CANVAS_MARGIN
+
+REGION_STEP = 500 # Model units; the region grows in steps so dragging at the edge rarely rescales
+
+
+class Minimap:
+    """
+    Downsampled overview of every visible node, drawn on its own small canvas.
+    The app reports each node add / move / resize / retype / delete, and the minimap
+    touches only that node's single item, so an edit costs one Tk call regardless of map size.
+    Items are kept in model units (the reference coordinates of app.bounds), so zooming the
+    main canvas only moves the viewport rectangle. Dragging on the minimap scrolls the main canvas.
+    """
+    def __init__(self, app, master, width=220, height=150):
+        self.app = app
+        self.width, self.height = width, height
+        self.canvas = tk.Canvas(master, width=width, height=height, bg="#fafafa",
+                                highlightthickness=1, highlightbackground="#999")
+        self.items = {} # LogicNode -> minimap rectangle id
+        self.visible = False
+        self.region = None # Shown model area (x1, y1, x2, y2)
+        self.scale = 1.0
+        self.set_region(self.content_region())
+        self.viewport_id = self.canvas.create_rectangle(0, 0, 0, 0, outline="red", width=2, tags="viewport")
+
+        self.canvas.bind("<ButtonPress-1>", self.on_drag)
+        self.canvas.bind("<B1-Motion>", self.on_drag)
+
+    def content_region(self):
+        """Model area to show: the content box plus a margin, rounded outward to REGION_STEP."""
+        box = self.app.bounds.ref_bbox() or (0, 0, 0, 0)
+        m, step = CANVAS_MARGIN, REGION_STEP
+        return (math.floor((box[0] - m) / step) * step, math.floor((box[1] - m) / step) * step,
+                math.ceil((box[2] + m) / step) * step, math.ceil((box[3] + m) / step) * step)
+
+    def set_region(self, region):
+        """Maps a model area onto the minimap, keeping its aspect ratio."""
+        x1, y1, x2, y2 = region
+        self.region = region
+        self.scale = min(self.width / max(1, x2 - x1), self.height / max(1, y2 - y1))
+
+    def content_changed(self):
+        """Follows the content box; items are moved and scaled in one call only when the region changes."""
+        region = self.content_region()
+        if region == self.region: return
+        old_region, old_scale = self.region, self.scale
+        self.set_region(region)
+        if not self.visible: return
+        k = self.scale / old_scale
+        self.canvas.scale("mm_node", 0, 0, k, k)
+        self.canvas.move("mm_node", (old_region[0] - self.region[0]) * self.scale,
+                         (old_region[1] - self.region[1]) * self.scale)
+        self.update_viewport()
+
+    def to_minimap(self, x, y):
+        """Main canvas point -> minimap point."""
+        x, y = self.app.bounds.to_ref(x, y)
+        return (x - self.region[0]) * self.scale, (y - self.region[1]) * self.scale
+
+    def show(self):
+        self.canvas.place(relx=1.0, rely=1.0, anchor="se", x=-4, y=-4)
+        self.visible = True
+        self.rebuild()
+
+    def hide(self):
+        self.canvas.place_forget()
+        self.visible = False
+
+    def toggle(self):
+        if self.visible: self.hide()
+        else: self.show()
+
+    def rebuild(self):
+        """Full redraw; only used when the minimap is (re)opened."""
+        self.canvas.delete("mm_node")
+        self.items = {}
+        self.set_region(self.content_region())
+        self.nodes_added([node for node in self.app.nodes if not node.hidden])
+        self.update_viewport()
+
+    def _box(self, node):
+        x1, y1, x2, y2 = node.model_box()
+        x1, y1 = self.to_minimap(x1, y1)
+        x2, y2 = self.to_minimap(x2, y2)
+        # Keep at least one pixel so tiny nodes stay visible
+        return x1, y1, max(x2, x1 + 1), max(y2, y1 + 1)
+
+    # --- Incremental updates -------------------------------------------------
+    def node_added(self, node):
+        if not self.visible: return
+        self.items[node] = self.canvas.create_rectangle(
+            *self._box(node), fill=COLORS.get(node.node_type, "white"), outline="", tags="mm_node")
+        # Raised by id: a tag lookup would scan every item on the minimap
+        self.canvas.tag_raise(self.viewport_id)
+
+    def nodes_added(self, nodes):
+        if not self.visible: return
+        for node in nodes:
+            self.items[node] = self.canvas.create_rectangle(
+                *self._box(node), fill=COLORS.get(node.node_type, "white"), outline="", tags="mm_node")
+        self.canvas.tag_raise(self.viewport_id)
+
+    def node_changed(self, node):
+        item = self.items.get(node)
+        if item: self.canvas.coords(item, *self._box(node))
+
+    def node_retyped(self, node):
+        item = self.items.get(node)
+        if item: self.canvas.itemconfig(item, fill=COLORS.get(node.node_type, "white"))
+
+    def node_removed(self, node):
+        item = self.items.pop(node, None)
+        if item: self.canvas.delete(item)
+
+    def begin_group_move(self, nodes):
+        self.canvas.dtag("move", "move")
+        for node in nodes:
+            item = self.items.get(node)
+            if item: self.canvas.addtag_withtag("move", item)
+
+    def move_group(self, dx, dy):
+        """Counterpart of the main canvas `move` tag: one call for the whole dragged group."""
+        if not self.visible: return
+        k = self.scale / self.app.bounds.scale # Canvas pixels -> model units -> minimap pixels
+        self.canvas.move("move", dx * k, dy * k)
+
+    def update_viewport(self):
+        if not self.visible: return
+        x1, y1, x2, y2 = self.app.viewport()
+        self.canvas.coords(self.viewport_id, *self.to_minimap(x1, y1), *self.to_minimap(x2, y2))
+
+    def on_drag(self, event):
+        """Centers the main view on the clicked minimap point."""
+        x = self.region[0] + event.x / self.scale
+        y = self.region[1] + event.y / self.scale
+        self.app.scroll_center_to(*self.app.bounds.to_canvas(x, y))
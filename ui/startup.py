@@ -0,0 +1,22 @@
+# ui/startup.py
+import sys
+import time
+
+
+class StartupTimer:
+    """Records named startup phases so time-to-first-interaction can be tracked."""
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = [] # [(name, phase ms, total ms)]
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, (now - self.last) * 1000, (now - self.start) * 1000))
+        self.last = now
+
+    def report(self, stream=None):
+        stream = stream or sys.stderr
+        print("--- Startup timings ---", file=stream)
+        for name, phase, total in self.phases:
+            print(f"{name:<24}{phase:8.1f} ms  (at {total:7.1f} ms)", file=stream)
@@ -0,0 +1,191 @@
+# ui/tasks.py
+"""
+Background work for the Tk app.
+
+Tk may only be touched from the main thread, so slow work (parsing and writing project
+files, copying attachments, launching viewers, image export) is submitted here instead of
+running inside a callback. Workers post progress and results to a queue that the main loop
+drains with `after`, so every callback handed to `submit` runs on the Tk thread.
+"""
+import queue
+import sys
+import threading
+import tkinter as tk
+from tkinter import messagebox
+
+
+class TaskCancelled(Exception):
+    """Raised inside a worker that noticed its cancellation token."""
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self): self._event.set()
+
+    @property
+    def cancelled(self): return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set(): raise TaskCancelled()
+
+
+_local = threading.local()
+
+
+def current_task():
+    """The Task whose worker is running on this thread (None outside thread-pool tasks)."""
+    return getattr(_local, "task", None)
+
+
+class Task:
+    """Handle of one submitted job."""
+    def __init__(self, manager, name, cancellable):
+        self.manager = manager
+        self.name = name
+        self.cancellable = cancellable
+        self.token = CancelToken()
+        self.future = None
+        self.progress = None # Fraction 0..1 once the worker reports one
+        self.message = ""
+
+    def report(self, fraction=None, message=None):
+        """Called by the worker. Also a cancellation point: raises TaskCancelled once cancelled."""
+        self.token.check()
+        self.manager._events.put(("progress", self, fraction, message))
+
+    def cancel(self):
+        if not self.cancellable: return
+        self.token.cancel()
+        self.future.cancel() # Drops it outright if it has not started yet
+
+
+class TaskManager:
+    """
+    Thread pool for file work and model building, and a one-thread lane for writes that
+    must happen in order. Threads rather than processes: results such as a parsed project
+    or a built map would cost about as much to pickle back as they took to make.
+    """
+    POLL_MS = 50
+
+    def __init__(self, root, workers=4):
+        self.root = root
+        self.workers = workers
+        self._threads = None
+        self._serial = None
+        self._events = queue.Queue()
+        self._polling = False
+        self.running = [] # Unfinished tasks, in submission order
+        self.on_change = None # Called on the Tk thread whenever `running` or a progress changes
+
+    def submit(self, name, fn, *args, on_done=None, on_error=None, serial=False, cancellable=True):
+        """
+        Runs fn(*args) in the background and returns its Task.
+        Workers can reach their Task through current_task() to report progress and check
+        for cancellation.
+        on_done(result) or on_error(exception) runs later on the Tk thread; neither runs for
+        a cancelled task. Errors without an on_error handler are shown in a message box.
+        """
+        # concurrent.futures is only imported once there is background work (startup time)
+        from concurrent.futures import ThreadPoolExecutor
+        task = Task(self, name, cancellable)
+        if serial:
+            if self._serial is None: self._serial = ThreadPoolExecutor(1, thread_name_prefix="task-serial")
+            task.future = self._serial.submit(self._run, task, fn, args)
+        else:
+            if self._threads is None: self._threads = ThreadPoolExecutor(self.workers, thread_name_prefix="task")
+            task.future = self._threads.submit(self._run, task, fn, args)
+        self.running.append(task)
+        task.future.add_done_callback(lambda f: self._events.put(("done", task, on_done, on_error)))
+        self._changed()
+        self._schedule_poll()
+        return task
+
+    @staticmethod
+    def _run(task, fn, args):
+        task.token.check()
+        _local.task = task
+        try:
+            return fn(*args)
+        finally:
+            _local.task = None
+
+    def cancel_all(self):
+        for task in list(self.running): task.cancel()
+
+    def shutdown(self):
+        """
+        Called on exit: cancels every cancellable task and drops queued work without waiting.
+        The serial lane keeps its queue, so saves already made are still written before the
+        process ends.
+        """
+        self.cancel_all()
+        if self._threads is not None: self._threads.shutdown(wait=False, cancel_futures=True)
+        if self._serial is not None: self._serial.shutdown(wait=False)
+
+    # --- Main-loop side ------------------------------------------------------
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        changed = False
+        while True:
+            try: event = self._events.get_nowait()
+            except queue.Empty: break
+            changed = True
+            if event[0] == "progress":
+                _, task, fraction, message = event
+                task.progress = fraction
+                if message is not None: task.message = message
+            else:
+                _, task, on_done, on_error = event
+                self.running.remove(task)
+                self._deliver(task, on_done, on_error)
+        if changed: self._changed()
+        if self.running: self._schedule_poll()
+
+    def _deliver(self, task, on_done, on_error):
+        f = task.future
+        if f.cancelled() or task.token.cancelled: return
+        exc = f.exception()
+        if isinstance(exc, TaskCancelled): return
+        try:
+            if exc is not None:
+                if on_error: on_error(exc)
+                else: messagebox.showerror("Error", f"{task.name} failed:\n{exc}")
+            elif on_done:
+                on_done(f.result())
+        except Exception:
+            # Keep draining: one failing callback must not stall every other task
+            self.root.report_callback_exception(*sys.exc_info())
+
+    def _changed(self):
+        if self.on_change: self.on_change()
+
+
+class TaskStatusBar:
+    """One-line indicator of running background tasks, with a Cancel button."""
+    def __init__(self, master, manager):
+        self.manager = manager
+        self.frame = tk.Frame(master, bd=1, relief=tk.SUNKEN)
+        self.label = tk.Label(self.frame, text="Ready", anchor="w", fg="#555")
+        self.label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=4)
+        self.btn_cancel = tk.Button(self.frame, text="Cancel", command=manager.cancel_all, pady=0)
+        manager.on_change = self.refresh
+
+    def refresh(self):
+        tasks = self.manager.running
+        if not tasks:
+            self.label.config(text="Ready"); self.btn_cancel.pack_forget(); return
+        task = tasks[0]
+        text = f"⏳ {task.name}"
+        if task.progress is not None: text += f" {int(task.progress * 100)}%"
+        if task.message: text += f" - {task.message}"
+        if len(tasks) > 1: text += f"   (+{len(tasks) - 1} more)"
+        self.label.config(text=text)
+        if any(t.cancellable for t in tasks): self.btn_cancel.pack(side=tk.RIGHT, padx=2)
+        else: self.btn_cancel.pack_forget()